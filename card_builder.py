@@ -2,18 +2,31 @@
 Module for building card data structure from Scryfall data
 """
 import logging
-from typing import Dict, List, Optional, Union, Tuple 
+from typing import DefaultDict, Dict, List, NamedTuple, Optional, Set, Union, Tuple 
 import io 
 import re 
+import string
 import json
 import time
 import os 
 import base64
+import tempfile
+import threading
+import sys
 import unicodedata 
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import unquote
+from posixpath import basename
+from types import MappingProxyType
 
 import requests 
-from PIL import Image 
+from requests.adapters import HTTPAdapter
+from PIL import Image, ImageFile
 from lxml import etree 
 
 from config import (
@@ -44,12 +57,227 @@ def calculate_font_size(text: str, box_width: float, box_height: float, initial_
         size -= 0.001
     return size
 
+def _render_path_format(path_format_str: Optional[str], **kwargs) -> str:
+    if not path_format_str:
+        if not ('pt_path_format' in str(kwargs.get('caller_description', '')) and kwargs.get('path_type_optional', False)):
+             raise FrameGenerationException("Path format string is None or empty.", f"Args: {kwargs}")
+        return "/img/error_path.png" 
+    try: return _compile_path_format(path_format_str)(kwargs)
+    except KeyError as e:
+        valid_args = {k: v for k, v in kwargs.items() if f"{{{k}}}" in path_format_str}
+        raise FrameGenerationException(f"KeyError formatting path '{path_format_str}'", f"Args: {valid_args}, Error: {e}")
+    except Exception as e_gen:
+        valid_args = {k: v for k, v in kwargs.items() if f"{{{k}}}" in path_format_str}
+        raise FrameGenerationException(f"Generic error formatting path '{path_format_str}'", f"Args: {valid_args}, Error: {e_gen}")
+
+# Path formats come from the frame configs and never change during a run, so each one is parsed
+# once into (literal, field, spec) segments and rendered with a join instead of str.format.
+@lru_cache(maxsize=None)
+def _compile_path_format(path_format_str: str):
+    parts = tuple(string.Formatter().parse(path_format_str))
+    if any(conversion or (field is not None and not field.isidentifier()) for _, field, _, conversion in parts):
+        return lambda args: path_format_str.format(**args)
+    def render(args: Dict) -> str:
+        return "".join(literal if field is None else literal + format(args[field], spec) for literal, field, spec, _ in parts)
+    return render
+
+# Frame/mask/land paths depend only on the frame config and a color code or mask name,
+# so they are memoized for the whole run instead of being reformatted for every card.
+@lru_cache(maxsize=None)
+def _format_frame_path(frame_path_fmt: Optional[str], frame_type: str, frame_set: str, color_code: str) -> str:
+    return _render_path_format(frame_path_fmt, caller_description="build_frame_path", frame=frame_type, frame_set=frame_set, color_code=color_code.lower())
+
+@lru_cache(maxsize=None)
+def _format_mask_path(frame_type: str, frame_set: str, mask_path_fmt: Optional[str], mask_name: str) -> str:
+    if frame_type == "8th": 
+        ext = ".svg" if mask_name == "border" else ".png"
+        return f"/img/frames/8th/{mask_name}{ext}"
+    return _render_path_format(mask_path_fmt, caller_description="build_mask_path", frame=frame_type, frame_set=frame_set, mask_name=mask_name)
+
+@lru_cache(maxsize=None)
+def _format_land_frame_path(frame_type: str, frame_set: str, uses_frame_set: bool, land_frame_path_fmt: Optional[str],
+                            frame_path_fmt: Optional[str], land_color_format: str, color_code: str) -> str:
+    if frame_type == "8th":
+        return f"/img/frames/8th/{color_code.lower()}l.png" 
+
+    if uses_frame_set: 
+        base_dir = f"/img/frames/{frame_type}/{frame_set}/"
+        return base_dir + land_color_format.format(color_code=color_code.lower())
+
+    if land_frame_path_fmt: 
+        return _render_path_format(land_frame_path_fmt, caller_description="build_land_frame_path specific", color_code=color_code.lower())
+    
+    if frame_path_fmt:
+        base_dir = frame_path_fmt.rsplit('/', 1)[0] + "/"
+        return base_dir + land_color_format.format(color_code=color_code.lower())
+
+    raise FrameGenerationException(f"Could not determine land frame path for {frame_type} with color {color_code}", "Please check the frame config.")
+
+@lru_cache(maxsize=None)
+def _format_color_path(path_fmt: Optional[str], color_code: str) -> str:
+    return _render_path_format(path_fmt, color_code=color_code)
+
+# Mask names each frame builder reads from the per-builder mask-src table; anything not listed
+# here is rendered by build_seventh_edition_frames.
+_FRAME_MASK_NAMES = {
+    "m15": ("Pinline", "Type", "Title", "Rules"),
+    "m15ub": ("Pinline", "Type", "Title", "Rules"),
+    "modern": ("pinline", "type", "title", "rules", "frame", "border"),
+    "8th": ("pinline", "type", "title", "rules", "frame", "border"),
+}
+_DEFAULT_MASK_NAMES = ("pinline", "rules", "frame", "trim", "border")
+
+# Layer and mask names come from a tiny vocabulary, so keep one interned copy of each.
+MASK_NAME_PINLINE = sys.intern("Pinline")
+MASK_NAME_TYPE = sys.intern("Type")
+MASK_NAME_TITLE = sys.intern("Title")
+MASK_NAME_RULES = sys.intern("Rules")
+MASK_NAME_FRAME = sys.intern("Frame")
+MASK_NAME_BORDER = sys.intern("Border")
+LAND_FRAME_NAME = sys.intern("Land Frame")
+
+@lru_cache(maxsize=256)
+def _frame_name(color_name: str) -> str:
+    return sys.intern(f"{color_name} Frame")
+
+@lru_cache(maxsize=256)
+def _land_frame_name(color_name: str) -> str:
+    return sys.intern(f"{color_name} Land Frame")
+
+# Mask dicts are shared by reference between layers and cards; nothing downstream mutates them.
+RIGHT_HALF_MASK = {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}
+
+def _mask_display_name(mask_name: str) -> str:
+    return sys.intern("Textbox Pinline" if mask_name == "trim" else mask_name.capitalize())
+
+class _FitBox(NamedTuple):
+    """Auto-fit target resolved once from a frame config: anchor point, box size in pixels and card size."""
+    x: float
+    y: float
+    abs_w: float
+    abs_h: float
+    card_w: float
+    card_h: float
+
+@dataclass(frozen=True, slots=True)
+class Layer:
+    """A single entry of the card object's "frames" list; masks are shared mask dicts."""
+    name: str
+    src: str
+    masks: Tuple[Dict[str, str], ...] = ()
+    bounds: Optional[Dict] = None
+
+    def to_dict(self) -> Dict:
+        layer = {"name": self.name, "src": self.src, "masks": list(self.masks)}
+        if self.bounds is not None: layer["bounds"] = self.bounds
+        return layer
+
+# Main frame layer recipes shared by the eighth edition and M15UB builders: (src_slot, mask_slot, has_right_half).
+# Two-color layouts put the secondary color under a Right Half mask on top of the primary color.
+_TWO_COLOR_LAYER_RECIPE = (
+    ("secondary", "pinline", True), ("primary", "pinline", False),
+    ("type_title", "type", False), ("type_title", "title", False),
+    ("secondary", "rules", True), ("primary", "rules", False),
+    ("frame_border", "frame", False), ("frame_border", "border", False),
+)
+_ONE_COLOR_LAYER_RECIPE = (
+    ("primary", "pinline", False),
+    ("type_title", "type", False), ("type_title", "title", False),
+    ("primary", "rules", False),
+    ("frame_border", "frame", False), ("frame_border", "border", False),
+)
+
+def _extend_from_recipe(layers: List[Layer], recipe: Tuple[Tuple[str, str, bool], ...], slots: Dict[str, Tuple[str, str]], masks: Dict[str, Dict[str, str]]) -> None:
+    for src_slot, mask_slot, has_right_half in recipe:
+        name, src = slots[src_slot]
+        mask = masks[mask_slot]
+        layers.append(Layer(name, src, (mask, RIGHT_HALF_MASK) if has_right_half else (mask,)))
+
+# Frame color descriptors used on every card; COLOR_CODE_MAP is static, so resolve them once.
+M_CODE, M_NAME = COLOR_CODE_MAP['M']['code'], COLOR_CODE_MAP['M']['name']
+L_CODE, L_NAME = COLOR_CODE_MAP['L']['code'], COLOR_CODE_MAP['L']['name']
+A_CODE, A_NAME = COLOR_CODE_MAP['A']['code'], COLOR_CODE_MAP['A']['name']
+V_CODE, V_NAME = COLOR_CODE_MAP['V']['code'], COLOR_CODE_MAP['V']['name']
+C_CODE, C_NAME = COLOR_CODE_MAP['C']['code'], COLOR_CODE_MAP['C']['name']
+_MONO_COLOR_CODES = frozenset(COLOR_CODE_MAP[k]['code'] for k in "WUBRG")
+PT_COLOR_TABLE = {"vehicle": (V_CODE, V_NAME), "gold": (M_CODE, M_NAME), "artifact": (A_CODE, A_NAME), "colorless": (C_CODE, C_NAME)}
+
+# M15UB P/T boxes with a fixed descriptor by color code; mono-colored boxes use the card's own color.
+_M15UB_PT_FIXED = {C_CODE: PT_COLOR_TABLE["colorless"]}
+
+def _classify_pt(color_info: Union[Dict, List], type_line: str) -> Tuple[Optional[str], str]:
+    """Returns the (color code, name prefix) of the M15UB power/toughness box."""
+    if 'Vehicle' in type_line: return PT_COLOR_TABLE["vehicle"]
+    if not isinstance(color_info, Mapping): return None, "Unknown"
+    if color_info.get('is_gold', False): return PT_COLOR_TABLE["gold"]
+    if color_info.get('is_artifact', False): return PT_COLOR_TABLE["artifact"]
+    code = color_info.get('code')
+    if code in _M15UB_PT_FIXED: return _M15UB_PT_FIXED[code]
+    if code in _MONO_COLOR_CODES: return code, color_info['name']
+    return None, "Unknown"
+
+# Eighth edition P/T boxes: artifact and gold have fixed names, colored/colorless boxes use the color name.
+_EIGHTH_PT_FIXED_NAMES = {'a': "Artifact", 'm': "Gold"}
+_EIGHTH_PT_COLOR_CODES = _MONO_COLOR_CODES | {C_CODE}
+
+def _classify_eighth_pt(color_info: Union[Dict, List]) -> Tuple[Optional[str], Optional[str]]:
+    if not isinstance(color_info, Mapping): return None, None
+    code = color_info.get('code')
+    if code in _EIGHTH_PT_FIXED_NAMES: return code, _EIGHTH_PT_FIXED_NAMES[code]
+    if code in _EIGHTH_PT_COLOR_CODES: return code, color_info.get('name')
+    return None, None
+
+def _m15ub_land_main_colors(color_info: List[Dict], card_name: str) -> Tuple:
+    primary_code, primary_name, secondary_code, secondary_name = None, "Unknown", None, None
+    if len(color_info) > 1 and isinstance(color_info[1], Mapping) and 'code' in color_info[1]: 
+        primary_code, primary_name = color_info[1]['code'], color_info[1]['name']
+        if len(color_info) > 2 and isinstance(color_info[2], Mapping) and 'code' in color_info[2]: secondary_code, secondary_name = color_info[2]['code'], color_info[2]['name']
+    elif len(color_info) == 1 and isinstance(color_info[0], Mapping) and 'code' in color_info[0]: primary_code, primary_name = color_info[0]['code'], color_info[0]['name']
+    else: logger.warning(f"Unexpected land color_info for '{card_name}'. Defaulting."); primary_code, primary_name = L_CODE, L_NAME
+    return primary_code, primary_name, secondary_code, secondary_name, L_CODE, L_NAME
+
+# M15UB main frame colors as (primary code, primary name, secondary code, secondary name, ttfb code, ttfb name) for non-land cards.
+_M15UB_UNCLASSIFIED = (None, "Unknown", None, None, None, None)
+
+_STREAM_CHUNK_SIZE = 64 << 10
+_HEADER_CHUNK_SIZE = 32 << 10
+# Upscale + upload jobs run in the background while later cards are built; this caps requests in flight to Ilaria.
+_UPSCALE_WORKERS = 4
+_UPLOAD_ATTEMPTS = 3
+FLAVOR_TEXT_Y_OFFSET = 0.025 # Adjust this value as needed
+# Recently fetched images kept in memory; set symbols and basic land art repeat across cards.
+_IMAGE_BYTES_CACHE_SIZE = 64
+# Scryfall art is served from its CDN (cards.scryfall.io), which is not rate limited like the API.
+_ART_PREFETCH_WORKERS = 8
+
+# Candidate extensions for previously hosted original art, probed in this order of preference.
+_HOSTED_ART_EXTENSIONS = ('.jpg', '.png', '.jpeg', '.webp', '.gif')
+_UPSCALED_ART_EXTENSIONS = ('.png',) + tuple(ext for ext in _HOSTED_ART_EXTENSIONS if ext != '.png')
+
+# File links in an nginx autoindex page; subdirectories (trailing slash) and the parent link are skipped.
+_AUTOINDEX_HREF_RE = re.compile(r'<a href="([^"/?][^"]*?[^"/])">')
+_FILENAME_UNSAFE_RE = re.compile(r'[\s/:<>:"\\|?*&]+')
+_DASH_RUN_RE = re.compile(r'-+')
+
+def _art_crop_url(card_data: Dict) -> str:
+    """The printing's art_crop URL, or that of its first face that has one; empty when there is none."""
+    if 'image_uris' in card_data and 'art_crop' in card_data['image_uris']: return card_data['image_uris']['art_crop']
+    for face in card_data.get('card_faces') or ():
+        if 'image_uris' in face and 'art_crop' in face['image_uris']: return face['image_uris']['art_crop']
+    return ""
+
+def _asset_key(card_name: str, set_code: str, collector_number: str) -> str:
+    """Base filename shared by every art asset of a printing; extensions/suffixes are appended."""
+    return f"{sanitize_for_filename(card_name)}_{sanitize_for_filename(set_code)}_{sanitize_for_filename(collector_number)}"
+
+# Card names, set codes and collector numbers repeat heavily across a batch.
+@lru_cache(maxsize=8192)
 def sanitize_for_filename(value: str) -> str:
     if not isinstance(value, str): value = str(value)
     value = value.replace("'", "")
     value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
-    value = re.sub(r'[\s/:<>:"\\|?*&]+', '-', value)
-    value = re.sub(r'-+', '-', value)
+    value = _FILENAME_UNSAFE_RE.sub('-', value)
+    value = _DASH_RUN_RE.sub('-', value)
     value = value.strip('-')
     return value.lower()
 
@@ -71,7 +299,8 @@ class CardBuilder:
                  image_server_base_url: Optional[str] = None, 
                  image_server_path_prefix: str = "/local_art",
                  output_dir: Optional[str] = None,
-                 upload_to_server: bool = False
+                 upload_to_server: bool = False,
+                 refetch_art: bool = False
                 ):
         self.frame_type = frame_type
         self.frame_config = frame_config
@@ -86,6 +315,7 @@ class CardBuilder:
         self.ilaria_upscaler_base_url = ilaria_upscaler_base_url
         self.upscaler_model_name = upscaler_model_name
         self.upscaler_outscale_factor = upscaler_outscale_factor if upscaler_outscale_factor > 0 else 1
+        self._upscaled_dir = f"{sanitize_for_filename(self.upscaler_model_name)}-{self.upscaler_outscale_factor}x"
         self.upscaler_denoise_strength = upscaler_denoise_strength
         self.upscaler_face_enhance = upscaler_face_enhance
         
@@ -101,6 +331,35 @@ class CardBuilder:
         
         self.output_dir = output_dir
         self.upload_to_server = upload_to_server
+        self.refetch_art = refetch_art
+        # Joined once: every hosted-art URL and local art path hangs off these roots.
+        self._image_root_url = f"{(image_server_base_url or '').rstrip('/')}{self.image_server_path_prefix}"
+        self._output_root = Path(output_dir) if output_dir else None
+        self._local_art_root = self._output_root / self.image_server_path_prefix.strip('/') if self._output_root else None
+        # One pooled session for image server and Scryfall image traffic so HEAD/GET/PUT reuse connections.
+        self._http_session = requests.Session()
+        self._http_session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"})
+        # Sized for the extension probes and background upscale uploads running at once.
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+        self._http_session.mount("http://", adapter); self._http_session.mount("https://", adapter)
+        self._probe_executor: Optional[ThreadPoolExecutor] = None
+        self._head_cache: Dict[str, bool] = {}
+        # Directory URL -> filenames from the server's autoindex listing, or None when the server doesn't list it.
+        self._server_manifest: Dict[str, Optional[Set[str]]] = {}
+        self._server_manifest_lock = threading.Lock()
+        self._bytes_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes_cache_lock = threading.Lock()
+        self._upscale_executor: Optional[ThreadPoolExecutor] = None
+        self._art_prefetch_executor: Optional[ThreadPoolExecutor] = None
+        # Art URL -> background download started by prefetch_art; consumed by _fetch_image_bytes.
+        self._art_prefetches: Dict[str, Future] = {}
+        # Asset key -> original art saved under output_dir by an earlier run; listed on first use.
+        self._local_originals: Optional[Dict[str, Path]] = None
+        self._ilaria_client: Optional[Client] = None
+        self._ilaria_client_lock = threading.Lock()
+        self._pending_upscales: List[Tuple[str, Dict, Future]] = []
+        # Hosted original extension hits per set; a set's art is almost always stored with a single extension.
+        self._ext_freq: DefaultDict[str, Counter] = defaultdict(Counter)
 
         if self.upscale_art and not self.ilaria_upscaler_base_url:
             logger.warning("Upscaling is enabled, but --ilaria_base_url is not configured. Upscaling will be skipped.")
@@ -115,6 +374,37 @@ class CardBuilder:
             except json.JSONDecodeError as e:
                 raise DataProcessingException(f"Error decoding symbol_placements.json: {e}", "Please check the file for syntax errors.")
 
+        # Frame config values read on every card are resolved once here instead of per card.
+        cfg = self.frame_config
+        self._base_frame_fmt = cfg.get("frame_path_format"); self._land_frame_fmt = cfg.get("land_frame_path_format"); self._mask_fmt = cfg.get("mask_path_format")
+        self._uses_frame_set = cfg.get("uses_frame_set", False); self._land_color_fmt = cfg.get("land_color_format", "{color_code}l.png")
+        self._pt_fmt = cfg.get("pt_path_format"); self._pt_bounds = cfg.get("pt_bounds")
+        self._crown_fmt = cfg.get("legend_crown_path_format"); self._crown_fmt_m15ub = cfg.get("legend_crown_path_format_m15ub")
+        self._crown_bounds = cfg.get("legend_crown_bounds"); self._crown_cover_src = cfg.get("legend_crown_cover_src", "/img/black.png"); self._crown_cover_bounds = cfg.get("legend_crown_cover_bounds")
+        self._frame_mask_src = cfg.get("frame_mask_name_for_main_frame_layer")
+        self._border_mask_src = cfg.get("border_mask_name_for_main_frame_layer")
+        self._text_cfg = cfg.get("text", {})
+        self._art_defaults = (cfg.get("art_x", 0.0), cfg.get("art_y", 0.0), cfg.get("art_zoom", 1.0), cfg.get("art_rotate", "0"))
+        self._set_symbol_defaults = (cfg.get("set_symbol_x", 0.0), cfg.get("set_symbol_y", 0.0), cfg.get("set_symbol_zoom", 0.1))
+        missing_keys = [key for key in ("frame_path_format", "mask_path_format", "pt_path_format") if not cfg.get(key)]
+        if missing_keys: logger.debug(f"Frame config '{self.frame_type}' has no {', '.join(missing_keys)}.")
+        rules_cfg = self._text_cfg.get("rules", {})
+        # Flavor text pushes the rules box down a little; both variants are fixed per frame.
+        self._rules_text_cfgs = (rules_cfg, {**rules_cfg, "y": rules_cfg["y"] + FLAVOR_TEXT_Y_OFFSET} if "y" in rules_cfg else rules_cfg)
+        self._card_template = self._build_card_template()
+        self._art_fit_geom: Optional[_FitBox] = None
+        self._set_symbol_fit_geom: Optional[_FitBox] = None
+        self._set_symbol_url_fmt = f"{ccProto}://{ccHost}:{ccPort}/img/setSymbols/official/{{code}}-{{rarity}}.svg"
+        # Set symbol URL -> auto-fit result; every card of a set and rarity shares one symbol.
+        self._set_symbol_fit_cache: Dict[str, Dict[str, any]] = {}
+        self._mask_srcs = self._build_mask_src_table()
+        self._shared_masks: Dict[str, Dict[str, str]] = {}
+        self._single_color_mask_tuple: Optional[Tuple[Dict[str, str], ...]] = None
+        self._recipe_masks: Optional[Dict[str, Dict[str, str]]] = None
+        # The frame type is fixed for the run, so the frame builder is picked once rather than per card.
+        self._build_frames = {"8th": self.build_eighth_edition_frames, "m15": self.build_m15_frames, "m15ub": self.build_m15ub_frames,
+                              "modern": self.build_modern_frames}.get(self.frame_type, self.build_seventh_edition_frames)
+
     # ... (methods from _extract_set_code_from_url to _get_svg_dimensions are unchanged) ...
     def _extract_set_code_from_url(self, url: str) -> Optional[str]:
         if not url: return None
@@ -123,6 +413,12 @@ class CardBuilder:
         else: logger.warning(f"Could not extract set_code from URL: {url}"); return None
 
     def _calculate_auto_fit_set_symbol_params(self, set_symbol_url: str) -> Optional[Dict[str, any]]:
+        cached = self._set_symbol_fit_cache.get(set_symbol_url)
+        if cached is None:
+            cached = self._set_symbol_fit_cache[set_symbol_url] = self._compute_auto_fit_set_symbol_params(set_symbol_url)
+        return cached
+
+    def _compute_auto_fit_set_symbol_params(self, set_symbol_url: str) -> Optional[Dict[str, any]]:
         set_code = self._extract_set_code_from_url(set_symbol_url)
         if set_code:
             lookup_key = f"{set_code}-{self.frame_type.lower()}"
@@ -132,28 +428,33 @@ class CardBuilder:
                     return { "setSymbolX": fixed_params['x'], "setSymbolY": fixed_params['y'], "setSymbolZoom": fixed_params['zoom'], "_status": "success_lookup" }
                 else: logger.warning(f"Invalid data for '{lookup_key}' in symbol_placements.json.")
         try:
-            response = requests.get(set_symbol_url, timeout=10); response.raise_for_status()
+            response = self._http_session.get(set_symbol_url, timeout=10); response.raise_for_status()
             svg_bytes = response.content
-            if self.api_delay_seconds > 0 and (not hasattr(response, 'from_cache') or response.from_cache is False if hasattr(response, 'from_cache') else True): time.sleep(self.api_delay_seconds)
             svg_dims = self._get_svg_dimensions(svg_bytes)
             if not svg_dims or svg_dims["width"] <= 0 or svg_dims["height"] <= 0:
                 raise DataProcessingException("Invalid SVG dimensions", f"Could not get valid dimensions from {set_symbol_url}")
-            card_w, card_h = self.frame_config.get("width"), self.frame_config.get("height")
-            bounds_cfg = self.frame_config.get("set_symbol_bounds")
-            align_x, align_y = self.frame_config.get("set_symbol_align_x_right"), self.frame_config.get("set_symbol_align_y_center")
-            if not (card_w and card_h and bounds_cfg and isinstance(bounds_cfg, dict) and all(k in bounds_cfg for k in ('x', 'y', 'width', 'height')) and align_x is not None and align_y is not None):
-                raise FrameGenerationException("Frame config incomplete for set symbol auto-fit", f"Please check the frame config for {self.frame_type}")
-            scale_x = (bounds_cfg["width"] * card_w) / svg_dims["width"]; scale_y = (bounds_cfg["height"] * card_h) / svg_dims["height"]
-            zoom = min(scale_x, scale_y)
+            fit = self._set_symbol_fit_geometry()
+            zoom = min(fit.abs_w / svg_dims["width"], fit.abs_h / svg_dims["height"])
             if zoom <= 1e-6:
                 raise DataProcessingException("Set symbol zoom too small", f"Calculated zoom for {set_symbol_url} is too small.")
-            scaled_w_rel = (svg_dims["width"] * zoom) / card_w; scaled_h_rel = (svg_dims["height"] * zoom) / card_h
-            return { "setSymbolX": align_x - scaled_w_rel, "setSymbolY": align_y - (scaled_h_rel / 2.0), "setSymbolZoom": zoom, "_status": "success_calculated" }
+            scaled_w_rel = (svg_dims["width"] * zoom) / fit.card_w; scaled_h_rel = (svg_dims["height"] * zoom) / fit.card_h
+            return { "setSymbolX": fit.x - scaled_w_rel, "setSymbolY": fit.y - (scaled_h_rel / 2.0), "setSymbolZoom": zoom, "_status": "success_calculated" }
         except requests.RequestException as e:
             raise ScryfallAPIException(f"Symbol SVG request error for {set_symbol_url}", str(e))
         except Exception as e:
             raise DataProcessingException(f"Symbol auto-fit error for {set_symbol_url}", str(e))
 
+    def _set_symbol_fit_geometry(self) -> _FitBox:
+        """Validated set symbol box from the frame config, anchored at its right/centre alignment; resolved once per builder."""
+        if self._set_symbol_fit_geom is None:
+            cfg = self.frame_config; card_w, card_h = cfg.get("width"), cfg.get("height")
+            b = cfg.get("set_symbol_bounds")
+            align_x, align_y = cfg.get("set_symbol_align_x_right"), cfg.get("set_symbol_align_y_center")
+            if not (card_w and card_h and b and isinstance(b, Mapping) and all(k in b for k in ('x', 'y', 'width', 'height')) and align_x is not None and align_y is not None):
+                raise FrameGenerationException("Frame config incomplete for set symbol auto-fit", f"Please check the frame config for {self.frame_type}")
+            self._set_symbol_fit_geom = _FitBox(align_x, align_y, b["width"] * card_w, b["height"] * card_h, card_w, card_h)
+        return self._set_symbol_fit_geom
+
     def _get_svg_dimensions(self, svg_content_bytes: bytes) -> Optional[Dict[str, float]]:
         if not svg_content_bytes: return None
         try:
@@ -179,35 +480,54 @@ class CardBuilder:
         except Exception as e:
             raise DataProcessingException(f"Error parsing SVG dimensions: {e}", "Please check the SVG file for errors.")
 
-    def _calculate_auto_fit_art_params_from_data(self, image_bytes: bytes, log_ref: str) -> Optional[Dict[str, float]]:
-        if not image_bytes:
-            raise ImageProcessingException("No image bytes for art auto-fit", f"No image data provided for {log_ref}")
-        try:
-            img = Image.open(io.BytesIO(image_bytes)); w, h = img.width, img.height; img.close()
-            if w == 0 or h == 0:
-                raise ImageProcessingException("Zero dimensions for art", f"Image dimensions for {log_ref} are zero.")
+    def _art_fit_geometry(self) -> _FitBox:
+        """Validated art box from the frame config, anchored at its top-left corner; resolved once per builder."""
+        if self._art_fit_geom is None:
             cfg = self.frame_config; card_w, card_h = cfg.get("width"), cfg.get("height")
             b = cfg.get("art_bounds")
-            if not (card_w and card_h and b and isinstance(b, dict) and all(k in b for k in ('x', 'y', 'width', 'height'))):
+            if not (card_w and card_h and b and isinstance(b, Mapping) and all(k in b for k in ('x', 'y', 'width', 'height'))):
                 raise FrameGenerationException("Incomplete config for art auto-fit", f"Please check the frame config for {self.frame_type}")
             if b["width"] <= 0 or b["height"] <= 0:
                 raise FrameGenerationException("Invalid art_bounds for auto-fit", f"Please check the frame config for {self.frame_type}")
-            abs_w, abs_h = b["width"] * card_w, b["height"] * card_h
-            zoom = max(abs_w / w, abs_h / h)
-            if zoom <= 1e-6:
-                raise ImageProcessingException("Art zoom too small for auto-fit", f"Calculated zoom for {log_ref} is too small.")
-            return {"artX": b["x"] + (abs_w - w * zoom) / 2 / card_w, "artY": b["y"] + (abs_h - h * zoom) / 2 / card_h, "artZoom": zoom}
+            self._art_fit_geom = _FitBox(b["x"], b["y"], b["width"] * card_w, b["height"] * card_h, card_w, card_h)
+        return self._art_fit_geom
+
+    def _calculate_auto_fit_art_params_from_data(self, image_bytes: Union[bytes, bytearray, memoryview, Path], log_ref: str) -> Optional[Dict[str, float]]:
+        if not image_bytes:
+            raise ImageProcessingException("No image bytes for art auto-fit", f"No image data provided for {log_ref}")
+        try:
+            # Image.open only parses the header; the size is all auto-fit needs, so pixels are never decoded.
+            with Image.open(image_bytes if isinstance(image_bytes, Path) else io.BytesIO(image_bytes)) as img: w, h = img.size
+            if w == 0 or h == 0:
+                raise ImageProcessingException("Zero dimensions for art", f"Image dimensions for {log_ref} are zero.")
+            return self._auto_fit_art_params_for_size(w, h, log_ref)
         except Exception as e:
             raise ImageProcessingException(f"Art auto-fit from data error for {log_ref}", str(e))
 
+    def _auto_fit_art_params_for_size(self, w: int, h: int, log_ref: str) -> Dict[str, float]:
+        fit = self._art_fit_geometry()
+        zoom = max(fit.abs_w / w, fit.abs_h / h)
+        if zoom <= 1e-6:
+            raise ImageProcessingException("Art zoom too small for auto-fit", f"Calculated zoom for {log_ref} is too small.")
+        return {"artX": fit.x + (fit.abs_w - w * zoom) / 2 / fit.card_w, "artY": fit.y + (fit.abs_h - h * zoom) / 2 / fit.card_h, "artZoom": zoom}
+
     def _calculate_auto_fit_art_params(self, art_url: str) -> Optional[Dict[str, float]]: # From baseline
         if not art_url: return None
         try:
-            logger.debug(f"Auto-fit: Fetching Scryfall art from {art_url} for dimension calculation.")
-            response = requests.get(art_url, timeout=10); response.raise_for_status()
-            if self.api_delay_seconds > 0 and (not hasattr(response, 'from_cache') or response.from_cache is False if hasattr(response, 'from_cache') else True):
-                time.sleep(self.api_delay_seconds)
-            return self._calculate_auto_fit_art_params_from_data(response.content, art_url)
+            logger.debug("Auto-fit: Fetching Scryfall art from %s for dimension calculation.", art_url)
+            # Only the size is needed: feed the stream to PIL's incremental parser and hang up once the header is parsed.
+            with self._http_session.get(art_url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                parser = ImageFile.Parser()
+                for chunk in response.iter_content(chunk_size=_HEADER_CHUNK_SIZE):
+                    parser.feed(chunk)
+                    if parser.image is not None: break
+            if parser.image is None:
+                raise ImageProcessingException("Unrecognized art image", f"Could not read image dimensions from {art_url}")
+            w, h = parser.image.size
+            if w == 0 or h == 0:
+                raise ImageProcessingException("Zero dimensions for art", f"Image dimensions for {art_url} are zero.")
+            return self._auto_fit_art_params_for_size(w, h, art_url)
         except requests.RequestException as e:
             raise ScryfallAPIException(f"Error in _calculate_auto_fit_art_params for {art_url}", str(e))
         except Exception as e:
@@ -215,31 +535,90 @@ class CardBuilder:
 
     def _fetch_image_bytes(self, url: str, purpose: str = "generic") -> Optional[bytes]: # General helper
         if not url: return None
+        with self._bytes_cache_lock:
+            cached = self._bytes_cache.get(url)
+            if cached is not None:
+                self._bytes_cache.move_to_end(url); logger.debug("Image cache hit for %s: %s", purpose, url)
+                return cached
+            prefetch = self._art_prefetches.pop(url, None)
+        image_bytes = prefetch.result() if prefetch else self._download_image_bytes(url, purpose)
+        if image_bytes:
+            with self._bytes_cache_lock:
+                self._bytes_cache[url] = image_bytes
+                if len(self._bytes_cache) > _IMAGE_BYTES_CACHE_SIZE: self._bytes_cache.popitem(last=False)
+        return image_bytes
+
+    def prefetch_art(self, card_data_list: List[Dict]):
+        """Starts downloading the Scryfall art of upcoming cards in the background so build_card_data finds it ready.
+        Only done when saving locally without uploading, the one case where the Scryfall art is always needed."""
+        if not self.output_dir or self.upload_to_server: return
+        for card_data in card_data_list:
+            url = _art_crop_url(card_data)
+            if url and self._local_original(_asset_key(card_data.get('name', ''), card_data.get('set', DEFAULT_INFO_SET), card_data.get('collector_number', '000'))): continue
+            with self._bytes_cache_lock:
+                if not url or url in self._art_prefetches or url in self._bytes_cache: continue
+                if self._art_prefetch_executor is None:
+                    self._art_prefetch_executor = ThreadPoolExecutor(max_workers=_ART_PREFETCH_WORKERS, thread_name_prefix="art-prefetch")
+                self._art_prefetches[url] = self._art_prefetch_executor.submit(self._download_image_bytes, url, "Scryfall original")
+
+    def _local_original(self, asset_key: str) -> Optional[Path]:
+        """The original art an earlier run saved for this printing under output_dir, if any (and not refetching).
+        The directory is listed once per run instead of probing every candidate extension per card."""
+        if self._local_art_root is None or self.refetch_art: return None
+        if self._local_originals is None:
+            originals: Dict[str, Path] = {}
+            try:
+                with os.scandir(self._local_art_root / "original") as entries:
+                    for entry in entries:
+                        stem, ext = os.path.splitext(entry.name)
+                        if ext.lower() in _HOSTED_ART_EXTENSIONS and entry.is_file(): originals.setdefault(stem, Path(entry.path))
+            except FileNotFoundError: pass
+            self._local_originals = originals
+        return self._local_originals.get(asset_key)
+
+    def _download_image_bytes(self, url: str, purpose: str) -> Optional[bytes]:
         try:
-            logger.debug(f"Fetching image for {purpose} from: {url}")
-            response = requests.get(url, timeout=10); response.raise_for_status()
-            if "scryfall.com" in url.lower() and self.api_delay_seconds > 0 and \
-               (not hasattr(response, 'from_cache') or response.from_cache is False if hasattr(response, 'from_cache') else True):
-                time.sleep(self.api_delay_seconds)
+            logger.debug("Fetching image for %s from: %s", purpose, url)
+            response = self._http_session.get(url, timeout=10); response.raise_for_status()
             return response.content
         except requests.RequestException as e:
             raise ImageProcessingException(f"Failed to fetch image for {purpose} from {url}", str(e))
             
-    def _get_image_mime_type_and_extension(self, image_bytes: bytes) -> tuple[Optional[str], Optional[str]]:
+    def _stream_image_to_temp(self, url: str, purpose: str = "generic", missing_ok: bool = False) -> Optional[Tuple[Path, Optional[str], Optional[str]]]:
+        """Streams an image into a temporary file instead of buffering it; the caller deletes the file.
+        With missing_ok, a non-200 answer returns None instead of raising, so the GET doubles as the existence check."""
+        if not url: return None
+        tmp_path: Optional[Path] = None
         try:
-            fmt = None; 
-            try: img = Image.open(io.BytesIO(image_bytes)); fmt = img.format; img.close()
-            except Exception: pass
-            if fmt == "JPEG": return "image/jpeg", ".jpg"
-            if fmt == "PNG": return "image/png", ".png"
-            if fmt == "GIF": return "image/gif", ".gif"
-            if fmt == "WEBP": return "image/webp", ".webp"
-            if image_bytes.startswith(b'\xff\xd8\xff'): return "image/jpeg", ".jpg"
-            if image_bytes.startswith(b'\x89PNG\r\n\x1a\n'): return "image/png", ".png"
-            if image_bytes.startswith(b'GIF87a') or image_bytes.startswith(b'GIF89a'): return "image/gif", ".gif"
-            if image_bytes.startswith(b'RIFF') and len(image_bytes) > 12 and image_bytes[8:12] == b'WEBP': return "image/webp", ".webp"
-            return "application/octet-stream", "" 
-        except Exception: return "application/octet-stream", ""
+            logger.debug("Streaming image for %s from: %s", purpose, url)
+            with self._http_session.get(url, timeout=10, stream=True) as response:
+                if missing_ok and response.status_code != 200:
+                    if response.status_code == 404: logger.info(f"Not found: {url}"); self._head_cache[url] = False
+                    else: logger.warning(f"Status {response.status_code} fetching {url}. Assuming not existent.")
+                    return None
+                response.raise_for_status()
+                with tempfile.NamedTemporaryFile(prefix="scry2cc_art_", delete=False) as tmp:
+                    tmp_path = Path(tmp.name); head = b""
+                    for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+                        if not head: head = chunk
+                        tmp.write(chunk)
+            self._head_cache[url] = True
+            if not head: tmp_path.unlink(missing_ok=True); return None
+            mime, ext = self._get_image_mime_type_and_extension(head)
+            return tmp_path, mime, ext
+        except Exception as e:
+            if tmp_path: tmp_path.unlink(missing_ok=True)
+            raise ImageProcessingException(f"Failed to stream image for {purpose} from {url}", str(e))
+
+    def _get_image_mime_type_and_extension(self, image_bytes: Union[bytes, bytearray, memoryview]) -> tuple[Optional[str], Optional[str]]:
+        # Only the formats below are mapped, and each is identified by its signature (the same check PIL's plugins
+        # accept on), so a copy of the first few bytes is all that is read; any bytes-like buffer works.
+        head = bytes(image_bytes[:12])
+        if head.startswith(b'\xff\xd8\xff'): return "image/jpeg", ".jpg"
+        if head.startswith(b'\x89PNG\r\n\x1a\n'): return "image/png", ".png"
+        if head.startswith(b'GIF87a') or head.startswith(b'GIF89a'): return "image/gif", ".gif"
+        if head.startswith(b'RIFF') and head[8:12] == b'WEBP': return "image/webp", ".webp"
+        return "application/octet-stream", ""
 
     def _upscale_image_with_ilaria(self, original_art_url_or_path: str, filename: str, mime: Optional[str]) -> Optional[bytes]:
         if not self.ilaria_upscaler_base_url:
@@ -247,34 +626,29 @@ class CardBuilder:
         if not original_art_url_or_path:
             raise ImageProcessingException(f"No original art URL or path for '{filename}'.", "Cannot upscale without a source image.")
 
-        img_bytes = None
+        temp_path: Optional[str] = None
         if self.output_dir:
-            local_path = Path(self.output_dir) / original_art_url_or_path.lstrip('/')
-            logger.debug(f"Upscaling: Reading original image from local path: {local_path}")
-            try:
-                with open(local_path, "rb") as f:
-                    img_bytes = f.read()
-            except FileNotFoundError:
-                raise ImageProcessingException(f"Upscaling failed: Original image not found at local path {local_path}", "Please ensure the original image exists.")
-            except Exception as e:
-                raise ImageProcessingException(f"Upscaling failed: Could not read local file {local_path}", str(e))
+            # The original was saved locally; hand that file to gradio as-is.
+            source_path = str(self._output_root / (original_art_url_or_path[1:] if original_art_url_or_path.startswith('/') else original_art_url_or_path))
+            logger.debug("Upscaling: Reading original image from local path: %s", source_path)
+            if not os.path.isfile(source_path):
+                raise ImageProcessingException(f"Upscaling failed: Original image not found at local path {source_path}", "Please ensure the original image exists.")
         else:
             img_bytes = self._fetch_image_bytes(original_art_url_or_path, "Upscaling with gradio_client")
-
-        if not img_bytes:
-            raise ImageProcessingException(f"Failed to get image bytes from {original_art_url_or_path}", "Cannot upscale without image data.")
+            if not img_bytes:
+                raise ImageProcessingException(f"Failed to get image bytes from {original_art_url_or_path}", "Cannot upscale without image data.")
+            try:
+                with tempfile.NamedTemporaryFile(prefix="scry2cc_upscale_", suffix=f"_{sanitize_for_filename(filename)}", delete=False) as tmp:
+                    tmp.write(img_bytes); temp_path = source_path = tmp.name
+            except Exception as e:
+                raise ImageProcessingException(f"Upscaling failed: Could not write temp file for '{filename}'", str(e))
 
         try:
-            logger.info(f"Connecting to Ilaria Upscaler via gradio_client.")
-            client = Client(self.ilaria_upscaler_base_url)
-
-            temp_path = f"/tmp/{sanitize_for_filename(filename)}"
-            with open(temp_path, "wb") as f:
-                f.write(img_bytes)
+            client = self._get_ilaria_client()
 
             logger.info(f"Upscaling {filename} using model '{self.upscaler_model_name}' via gradio_client.")
             result = client.predict(
-                img=gradio_file(temp_path),
+                img=gradio_file(source_path),
                 model_name=self.upscaler_model_name,
                 denoise_strength=self.upscaler_denoise_strength,
                 face_enhance=self.upscaler_face_enhance,
@@ -294,23 +668,133 @@ class CardBuilder:
 
         except Exception as e:
             raise ImageProcessingException(f"Gradio upscaling error for '{filename}'", str(e))
+        finally:
+            if temp_path: Path(temp_path).unlink(missing_ok=True)
+
+    def _get_ilaria_client(self) -> Client:
+        """One gradio Client per builder, shared by the upscale workers; connecting fetches the app's API schema."""
+        with self._ilaria_client_lock:
+            if self._ilaria_client is None:
+                logger.info(f"Connecting to Ilaria Upscaler via gradio_client.")
+                self._ilaria_client = Client(self.ilaria_upscaler_base_url)
+            return self._ilaria_client
+
+    def _upscale_and_host(self, original_art_url_or_path: str, filename: str, mime: Optional[str], upscaled_dir: str, asset_key: str) -> Optional[str]:
+        upscaled_bytes = self._upscale_image_with_ilaria(original_art_url_or_path, filename, mime)
+        if not upscaled_bytes: return None
+        upscaled_mime, upscaled_ext = self._get_image_mime_type_and_extension(upscaled_bytes)
+        upscaled_filename = f"{asset_key}{upscaled_ext or '.png'}"
+        for attempt in range(_UPLOAD_ATTEMPTS):
+            try: self._output_image(upscaled_bytes, upscaled_dir, upscaled_filename, upscaled_mime); break
+            except ImageProcessingException as e:
+                if attempt == _UPLOAD_ATTEMPTS - 1: raise
+                logger.warning(f"Saving upscaled '{upscaled_filename}' failed ({e.reason}); retrying in {2 ** attempt}s.")
+                time.sleep(2 ** attempt)
+        return f"{self._image_root_url}/{upscaled_dir}/{upscaled_filename}"
+
+    def finish_pending_upscales(self) -> int:
+        """Waits for background upscales and points their cards at the upscaled art. Returns how many were applied."""
+        pending = {future: (card_name, card_obj_data) for card_name, card_obj_data, future in self._pending_upscales}
+        self._pending_upscales = []
+        applied = 0
+        for future in as_completed(pending):
+            card_name, card_obj_data = pending[future]
+            try: hosted_upscaled_art_url = future.result()
+            except Exception as e:
+                logger.error(f"Upscaling failed for '{card_name}', keeping original art: {e}"); continue
+            if not hosted_upscaled_art_url: continue
+            card_obj_data["artSource"] = hosted_upscaled_art_url
+            if self.upscaler_outscale_factor > 0:
+                card_obj_data["artZoom"] /= self.upscaler_outscale_factor
+                logger.info(f"Adjusted artZoom for upscaled image to: {card_obj_data['artZoom']:.4f}")
+            applied += 1
+        return applied
+
+    def _directory_manifest(self, dir_url: str) -> Optional[Set[str]]:
+        """Lists a hosted art directory once via nginx autoindex (HTML or JSON format); None if it isn't browsable."""
+        with self._server_manifest_lock:
+            if dir_url in self._server_manifest: return self._server_manifest[dir_url]
+            manifest: Optional[Set[str]] = None
+            try:
+                r = self._http_session.get(f"{dir_url}/", timeout=15)
+                if r.status_code == 200:
+                    # Only a real autoindex counts; a SPA shell, login or custom 200 error page must not look like an empty listing.
+                    if "json" in r.headers.get("Content-Type", ""):
+                        entries = r.json()
+                        if isinstance(entries, list) and all(isinstance(entry, Mapping) and "name" in entry and "type" in entry for entry in entries):
+                            manifest = {entry["name"] for entry in entries if entry["type"] == "file"}
+                    elif "<title>Index of" in r.text:
+                        manifest = {unquote(href) for href in _AUTOINDEX_HREF_RE.findall(r.text)}
+                    if manifest is not None: logger.info(f"Loaded listing of {len(manifest)} files from {dir_url}/")
+            except Exception as e: logger.debug("No directory listing for %s/: %s", dir_url, e)
+            self._server_manifest[dir_url] = manifest
+            return manifest
+
+    def _known_existence(self, public_url: str) -> Optional[bool]:
+        """Answers from the HEAD cache or the directory listing without a per-file request; None if unknown.
+        The listing is only trusted for hits: a file missing from it (uploaded since, or listing truncated) is left to the HEAD probe."""
+        exists = self._head_cache.get(public_url)
+        if exists is not None or not self.upload_to_server or not public_url.startswith(self._image_root_url): return exists
+        dir_url, filename = public_url.rsplit('/', 1)
+        manifest = self._directory_manifest(dir_url)
+        return True if manifest is not None and filename in manifest else None
 
     def _check_if_file_exists_on_server(self, public_url: str) -> bool:
         if not public_url: return False
+        # Only definite 200/404 answers are cached; errors are re-probed on the next lookup.
+        exists = self._known_existence(public_url)
+        if exists is not None: logger.debug("Existence cache hit (%s): %s", exists, public_url); return exists
         try:
-            r = requests.head(public_url, timeout=15, allow_redirects=True) 
-            if r.status_code == 200: logger.info(f"Exists: {public_url}"); return True
-            if r.status_code == 404: logger.info(f"Not found: {public_url}"); return False
+            r = self._http_session.head(public_url, timeout=15, allow_redirects=True) 
+            if r.status_code == 200: logger.info(f"Exists: {public_url}"); self._head_cache[public_url] = True; return True
+            if r.status_code == 404: logger.info(f"Not found: {public_url}"); self._head_cache[public_url] = False; return False
             logger.warning(f"Status {r.status_code} checking {public_url}. Assuming not existent."); return False 
         except Exception as e: logger.warning(f"Error checking {public_url}: {e}. Assuming not existent."); return False
 
-    def _output_image(self, img_bytes: bytes, sub_dir: str, filename: str):
+    def _existing_extension_urls(self, base_url: str, extensions: List[str]):
+        """Probes all candidate extensions concurrently and yields (url, ext) hits in preference order."""
+        if self._probe_executor is None:
+            self._probe_executor = ThreadPoolExecutor(max_workers=len(_HOSTED_ART_EXTENSIONS), thread_name_prefix="art-probe")
+        candidates = [(f"{base_url}{ext}", ext) for ext in extensions]
+        # URLs with a cached answer are resolved inline; only unknown ones go out, all at once over the pooled connections.
+        futures = {url: self._probe_executor.submit(self._check_if_file_exists_on_server, url)
+                   for url, _ in candidates if self._head_cache.get(url) is None}
+        try:
+            for url, ext in candidates:
+                future = futures.get(url)
+                if (future.result() if future else self._head_cache[url]): yield url, ext
+        finally:
+            for future in futures.values(): future.cancel()
+
+    def _first_existing_url(self, base_url: str, extensions: Tuple[str, ...]) -> Optional[str]:
+        probes = self._existing_extension_urls(base_url, list(extensions))
+        try: return next(probes, (None, None))[0]
+        finally: probes.close()
+
+    def _fetch_hosted_original(self, base_url: str, set_key: str, initial_ext: str) -> Optional[Tuple[str, str, Tuple[Path, Optional[str], Optional[str]]]]:
+        """Streams the hosted original, returning (url, ext, streamed) or None.
+        The likeliest extension (the set's most common one, else the Scryfall one) is fetched with a plain GET, so a hit
+        costs one round-trip; only on a miss are the other extensions HEAD-probed concurrently."""
+        extensions = [initial_ext, *(ext for ext in _HOSTED_ART_EXTENSIONS if ext != initial_ext)]
+        ext_counts = self._ext_freq.get(set_key)
+        if ext_counts: extensions.sort(key=lambda ext: -ext_counts[ext])
+        preferred_url = f"{base_url}{extensions[0]}"
+        if self._known_existence(preferred_url) is not False:
+            streamed = self._stream_image_to_temp(preferred_url, "server original", missing_ok=True)
+            if streamed: return preferred_url, extensions[0], streamed
+        for potential_url, ext_hit in self._existing_extension_urls(base_url, extensions[1:]):
+            streamed = self._stream_image_to_temp(potential_url, "server original")
+            if streamed: return potential_url, ext_hit, streamed
+        return None
+
+    def _output_image(self, img_bytes: bytes, sub_dir: str, filename: str, mime: Optional[str] = None):
+        """Saves or uploads an image; pass the already-detected MIME type to skip sniffing the bytes again."""
         if not img_bytes:
             raise ImageProcessingException(f"No image bytes provided for '{filename}' in '{sub_dir}'.", "Cannot save empty image.")
 
         if self.output_dir:
             try:
-                local_save_dir = Path(self.output_dir) / self.image_server_path_prefix.strip('/') / sub_dir.strip('/')
+                local_save_dir = self._local_art_root / sub_dir.strip('/')
                 local_save_dir.mkdir(parents=True, exist_ok=True)
                 local_file_path = local_save_dir / filename
                 with open(local_file_path, 'wb') as f:
@@ -323,80 +807,92 @@ class CardBuilder:
             if not self.image_server_base_url:
                 raise ImageProcessingException(f"Cannot upload '{filename}': --upload-to-server is set, but --image-server-base-url is not.", "Please configure the --image-server-base-url argument.")
             
-            upload_url = f"{self.image_server_base_url.rstrip('/')}{self.image_server_path_prefix}/{sub_dir.strip('/')}/{filename}"
+            upload_url = f"{self._image_root_url}/{sub_dir.strip('/')}/{filename}"
             
             logger.info(f"Uploading '{filename}' to: {upload_url}")
-            mime, _ = self._get_image_mime_type_and_extension(img_bytes)
+            if not mime: mime, _ = self._get_image_mime_type_and_extension(img_bytes)
             headers = {'Content-Type': mime if mime else 'application/octet-stream'}
             try:
-                r = requests.put(upload_url, data=img_bytes, headers=headers, timeout=60)
+                r = self._http_session.put(upload_url, data=img_bytes, headers=headers, timeout=60)
                 r.raise_for_status()
                 logger.info(f"Successfully uploaded '{filename}'.")
+                self._head_cache[upload_url] = True
+                with self._server_manifest_lock:
+                    manifest = self._server_manifest.get(upload_url.rsplit('/', 1)[0])
+                    if manifest is not None: manifest.add(filename)
+                with self._bytes_cache_lock: self._bytes_cache.pop(upload_url, None)
             except Exception as e:
                 raise ImageProcessingException(f"Upload error for '{filename}'", str(e))
     
     # ... (rest of the file is unchanged) ...
     def _format_path(self, path_format_str: Optional[str], **kwargs) -> str: # From baseline
-        if not path_format_str:
-            if not ('pt_path_format' in str(kwargs.get('caller_description', '')) and kwargs.get('path_type_optional', False)):
-                 raise FrameGenerationException("Path format string is None or empty.", f"Args: {kwargs}")
-            return "/img/error_path.png" 
-        valid_args = {k: v for k, v in kwargs.items() if f"{{{k}}}" in path_format_str}
-        try: return path_format_str.format(**valid_args)
-        except KeyError as e:
-            raise FrameGenerationException(f"KeyError formatting path '{path_format_str}'", f"Args: {valid_args}, Error: {e}")
-        except Exception as e_gen:
-            raise FrameGenerationException(f"Generic error formatting path '{path_format_str}'", f"Args: {valid_args}, Error: {e_gen}")
+        return _render_path_format(path_format_str, **kwargs)
 
     def build_frame_path(self, color_code: str) -> str:
-        return self._format_path(
-            self.frame_config.get("frame_path_format"),
-            caller_description="build_frame_path",
-            frame=self.frame_type,
-            frame_set=self.frame_set,
-            color_code=color_code.lower()
-        )
+        return _format_frame_path(self._base_frame_fmt, self.frame_type, self.frame_set, color_code)
     
     def build_mask_path(self, mask_name: str) -> str:
-        if self.frame_type == "8th": 
-            ext = ".svg" if mask_name == "border" else ".png"
-            return f"/img/frames/8th/{mask_name}{ext}"
-        
-        return self._format_path(
-            self.frame_config.get("mask_path_format"),
-            caller_description="build_mask_path",
-            frame=self.frame_type,
-            frame_set=self.frame_set,
-            mask_name=mask_name
-        )
+        return _format_mask_path(self.frame_type, self.frame_set, self._mask_fmt, mask_name)
     
-    def build_land_frame_path(self, color_code: str) -> str:
-        if self.frame_type == "8th":
-            return f"/img/frames/8th/{color_code.lower()}l.png" 
-
-        if self.frame_config.get("uses_frame_set", False): 
-            base_dir = f"/img/frames/{self.frame_type}/{self.frame_set}/"
-            land_filename_format = self.frame_config.get("land_color_format", "{color_code}l.png")
-            return base_dir + land_filename_format.format(color_code=color_code.lower())
-
-        if "land_frame_path_format" in self.frame_config: 
-            return self._format_path(
-                self.frame_config.get("land_frame_path_format"),
-                caller_description="build_land_frame_path specific",
-                color_code=color_code.lower() 
-            )
-        
-        main_frame_path_format = self.frame_config.get("frame_path_format")
-        if main_frame_path_format:
-            base_dir = main_frame_path_format.rsplit('/', 1)[0] + "/"
-            land_filename_format = self.frame_config.get("land_color_format", "{color_code}l.png")
-            return base_dir + land_filename_format.format(color_code=color_code.lower())
+    def _build_card_template(self) -> MappingProxyType:
+        """Card object fields that only depend on the frame config, in output order; per-card fields are filled in by build_card_data."""
+        cfg = self.frame_config
+        template = {
+            "width": cfg["width"], "height": cfg["height"],
+            "marginX": cfg.get("margin_x", 0), "marginY": cfg.get("margin_y", 0),
+            "frames": None, "artSource": None, "artX": None, "artY": None, "artZoom": None, "artRotate": None, "artSourceOriginalScryfall": None,
+            "setSymbolSource": None, "setSymbolX": None, "setSymbolY": None, "setSymbolZoom": None,
+            "watermarkSource": f"{ccProto}://{ccHost}:{ccPort}/{cfg['watermark_source']}",
+            "watermarkX": cfg["watermark_x"], "watermarkY": cfg["watermark_y"], "watermarkZoom": cfg["watermark_zoom"],
+            "watermarkLeft": cfg["watermark_left"], "watermarkRight": cfg["watermark_right"], "watermarkOpacity": cfg["watermark_opacity"],
+            "version": cfg.get("version_string", self.frame_type),
+            "showsFlavorBar": None, "manaSymbols": None,
+            "infoYear": DEFAULT_INFO_YEAR, "margins": cfg.get("margins", False),
+            "bottomInfoTranslate": cfg.get("bottomInfoTranslate", {"x": 0, "y": 0}), "bottomInfoRotate": cfg.get("bottomInfoRotate", 0),
+            "bottomInfoZoom": cfg.get("bottomInfoZoom", 1), "bottomInfoColor": cfg.get("bottomInfoColor", "white"),
+            "onload": cfg.get("onload", None), "hideBottomInfoBorder": cfg.get("hideBottomInfoBorder", False),
+            "bottomInfo": cfg.get("bottom_info", {}), "artBounds": cfg.get("art_bounds", {}),
+            "setSymbolBounds": cfg.get("set_symbol_bounds", {}), "watermarkBounds": cfg.get("watermark_bounds", {}),
+            "text": None, "infoNumber": None, "infoRarity": None, "infoSet": None,
+            "infoLanguage": DEFAULT_INFO_LANGUAGE, "infoArtist": None, "infoNote": DEFAULT_INFO_NOTE,
+            "noCorners": cfg.get("noCorners", True),
+        }
+        if self.frame_type == "8th": template.update({"serialNumber": "", "serialTotal": "", "serialX": "", "serialY": "", "serialScale": ""})
+        return MappingProxyType(template)
+
+    def _build_mask_src_table(self) -> Dict[str, str]:
+        if self.frame_type != "8th" and not self._mask_fmt: return {}
+        mask_names = _FRAME_MASK_NAMES.get(self.frame_type, _DEFAULT_MASK_NAMES)
+        return {mask_name: self.build_mask_path(mask_name) for mask_name in mask_names}
+
+    def _mask_src(self, mask_name: str) -> str:
+        return self._mask_srcs.get(mask_name) or self.build_mask_path(mask_name)
+    
+    def _shared_mask(self, mask_name: str) -> Dict[str, str]:
+        mask = self._shared_masks.get(mask_name)
+        if mask is None: mask = self._shared_masks[mask_name] = {"src": self._mask_src(mask_name), "name": _mask_display_name(mask_name)}
+        return mask
+
+    def _single_color_masks(self) -> Tuple[Dict[str, str], ...]:
+        if self._single_color_mask_tuple is None:
+            self._single_color_mask_tuple = tuple(self._shared_mask(mask_name) for mask_name in _FRAME_MASK_NAMES.get(self.frame_type, _DEFAULT_MASK_NAMES))
+        return self._single_color_mask_tuple
 
-        raise FrameGenerationException(f"Could not determine land frame path for {self.frame_type} with color {color_code}", "Please check the frame config.")
+    def _m15ub_recipe_masks(self) -> Dict[str, Dict[str, str]]:
+        if self._recipe_masks is None:
+            self._recipe_masks = {mask_name.lower(): {"src": self._mask_srcs[mask_name], "name": mask_name} for mask_name in (MASK_NAME_PINLINE, MASK_NAME_TYPE, MASK_NAME_TITLE, MASK_NAME_RULES)}
+            self._recipe_masks["frame"] = {"src": self._frame_mask_src, "name": MASK_NAME_FRAME}; self._recipe_masks["border"] = {"src": self._border_mask_src, "name": MASK_NAME_BORDER}
+        return self._recipe_masks
+
+    def build_land_frame_path(self, color_code: str) -> str:
+        return _format_land_frame_path(
+            self.frame_type, self.frame_set, self._uses_frame_set,
+            self._land_frame_fmt, self._base_frame_fmt, self._land_color_fmt, color_code
+        )
 
     def build_pt_frame_path(self, color_code: str) -> Optional[str]:
         return self._format_path(
-            self.frame_config.get("pt_path_format"),
+            self._pt_fmt,
             caller_description="build_pt_frame_path", path_type_optional=True,
             frame=self.frame_type,
             color_code=color_code, 
@@ -404,234 +900,208 @@ class CardBuilder:
             color_code_lower=color_code.lower()
         )
 
-    def build_m15_frames(self, color_info: Union[Dict, List], card_data: Dict) -> List[Dict]:
+    def build_m15_frames(self, color_info: Union[Dict, List], card_data: Dict) -> List[Layer]:
         generated_frames = []
         card_name_for_logging = card_data.get('name', 'Unknown Card')
         is_legendary = 'Legendary' in card_data.get('type_line', '')
         if self.legendary_crowns and is_legendary:
             primary_crown_color_code, secondary_crown_color_code = None, None
             primary_crown_color_name, secondary_crown_color_name = "Legend", "Secondary"
-            if isinstance(color_info, dict) and color_info.get('is_gold') and color_info.get('component_colors'):
+            if isinstance(color_info, Mapping) and color_info.get('is_gold') and color_info.get('component_colors'):
                 components = color_info['component_colors']
                 if len(components) >= 1: primary_crown_color_code, primary_crown_color_name = components[0]['code'], components[0]['name']
                 if len(components) >= 2: secondary_crown_color_code, secondary_crown_color_name = components[1]['code'], components[1]['name']
-            elif isinstance(color_info, dict) and color_info.get('code'): 
+            elif isinstance(color_info, Mapping) and color_info.get('code'): 
                 primary_crown_color_code, primary_crown_color_name = color_info['code'], color_info['name']
             
             if primary_crown_color_code:
-                crown_path_format = self.frame_config.get("legend_crown_path_format") 
-                crown_bounds = self.frame_config.get("legend_crown_bounds")
-                cover_bounds = self.frame_config.get("legend_crown_cover_bounds") 
+                crown_path_format, crown_bounds, cover_bounds = self._crown_fmt, self._crown_bounds, self._crown_cover_bounds
                 if crown_path_format and crown_bounds and cover_bounds:
                     if secondary_crown_color_code:
-                        generated_frames.append({"name": f"{secondary_crown_color_name} Legend Crown", "src": self._format_path(crown_path_format, color_code_upper=secondary_crown_color_code.upper()), "masks": [{"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}], "bounds": crown_bounds})
-                    generated_frames.append({"name": f"{primary_crown_color_name} Legend Crown", "src": self._format_path(crown_path_format, color_code_upper=primary_crown_color_code.upper()), "masks": [], "bounds": crown_bounds})
-                    generated_frames.append({"name": "Legend Crown Border Cover", "src": "/img/black.png", "masks": [], "bounds": cover_bounds})
+                        generated_frames.append(Layer(f"{secondary_crown_color_name} Legend Crown", self._format_path(crown_path_format, color_code_upper=secondary_crown_color_code.upper()), (RIGHT_HALF_MASK,), crown_bounds))
+                    generated_frames.append(Layer(f"{primary_crown_color_name} Legend Crown", self._format_path(crown_path_format, color_code_upper=primary_crown_color_code.upper()), (), crown_bounds))
+                    generated_frames.append(Layer("Legend Crown Border Cover", "/img/black.png", (), cover_bounds))
             elif is_legendary: logger.warning(f"Could not determine color for M15 legendary crown on '{card_name_for_logging}'.")
 
         if 'power' in card_data and 'toughness' in card_data:
             pt_code, pt_name_prefix = None, "Unknown"
-            if isinstance(color_info, dict) and color_info.get('is_gold'): pt_code, pt_name_prefix = COLOR_CODE_MAP['M']['code'], COLOR_CODE_MAP['M']['name']
-            elif isinstance(color_info, dict) and color_info.get('code'): pt_code, pt_name_prefix = color_info['code'], color_info['name']
+            if isinstance(color_info, Mapping) and color_info.get('is_gold'): pt_code, pt_name_prefix = M_CODE, M_NAME
+            elif isinstance(color_info, Mapping) and color_info.get('code'): pt_code, pt_name_prefix = color_info['code'], color_info['name']
             if pt_code:
                 pt_path = self.build_pt_frame_path(pt_code) 
-                pt_bounds = self.frame_config.get("pt_bounds")
-                if pt_path and pt_bounds and "/error_path" not in pt_path: generated_frames.append({"name": f"{pt_name_prefix} Power/Toughness", "src": pt_path, "masks": [], "bounds": pt_bounds})
+                pt_bounds = self._pt_bounds
+                if pt_path and pt_bounds and "/error_path" not in pt_path: generated_frames.append(Layer(f"{pt_name_prefix} Power/Toughness", pt_path, (), pt_bounds))
         
-        main_frame_layers = []; base_frame_path_fmt = self.frame_config.get("frame_path_format"); mask_path_fmt = self.frame_config.get("mask_path_format")
-        main_frame_mask_src = self.frame_config.get("frame_mask_name_for_main_frame_layer"); main_border_mask_src = self.frame_config.get("border_mask_name_for_main_frame_layer")
+        base_frame_path_fmt = self._base_frame_fmt; mask_path_fmt = self._mask_fmt
+        main_frame_mask_src = self._frame_mask_src; main_border_mask_src = self._border_mask_src
         if not all([base_frame_path_fmt, mask_path_fmt, main_frame_mask_src, main_border_mask_src]): return generated_frames
 
         primary_color_code, primary_color_name = None, "Unknown"; secondary_color_code, secondary_color_name = None, None
-        base_multicolor_code = COLOR_CODE_MAP['M']['code']; base_multicolor_name = COLOR_CODE_MAP['M']['name']
+        base_multicolor_code = M_CODE; base_multicolor_name = M_NAME
         ttfb_code, ttfb_name = None, None 
         is_land = isinstance(color_info, list)
         if is_land:
-            ttfb_code, ttfb_name = COLOR_CODE_MAP['L']['code'], COLOR_CODE_MAP['L']['name']
+            ttfb_code, ttfb_name = L_CODE, L_NAME
             if len(color_info) > 1: primary_color_code, primary_color_name = color_info[1]['code'], color_info[1]['name']
             if len(color_info) > 2: secondary_color_code, secondary_color_name = color_info[2]['code'], color_info[2]['name']
             if not primary_color_code and len(color_info) == 1: primary_color_code, primary_color_name = color_info[0]['code'], color_info[0]['name']
 
         if not primary_color_code or not ttfb_code: return generated_frames
         
-        src_primary = self._format_path(base_frame_path_fmt, color_code=primary_color_code)
-        src_secondary = self._format_path(base_frame_path_fmt, color_code=secondary_color_code) if secondary_color_code else None
-        src_ttfb = self._format_path(base_frame_path_fmt, color_code=ttfb_code)
-        pinline_mask = self._format_path(mask_path_fmt, mask_name="Pinline")
-        type_mask = self._format_path(mask_path_fmt, mask_name="Type")
-        title_mask = self._format_path(mask_path_fmt, mask_name="Title")
-        rules_mask = self._format_path(mask_path_fmt, mask_name="Rules")
+        src_primary = _format_color_path(base_frame_path_fmt, primary_color_code)
+        src_secondary = _format_color_path(base_frame_path_fmt, secondary_color_code) if secondary_color_code else None
+        src_ttfb = _format_color_path(base_frame_path_fmt, ttfb_code)
+        pinline_mask = self._mask_srcs["Pinline"]
+        type_mask = self._mask_srcs["Type"]
+        title_mask = self._mask_srcs["Title"]
+        rules_mask = self._mask_srcs["Rules"]
+        primary_fn, ttfb_fn = _frame_name(primary_color_name), _frame_name(ttfb_name)
+        secondary_fn = _frame_name(secondary_color_name) if secondary_color_name else None
 
         if secondary_color_code and src_secondary and "/error_path" not in src_secondary: 
-            main_frame_layers.extend([
-                {"name": f"{secondary_color_name} Frame", "src": src_secondary, "masks": [{"src": pinline_mask, "name": "Pinline"}, {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}]},
-                {"name": f"{primary_color_name} Frame", "src": src_primary, "masks": [{"src": pinline_mask, "name": "Pinline"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": type_mask, "name": "Type"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": title_mask, "name": "Title"}]},
-                {"name": f"{secondary_color_name} Frame", "src": src_secondary, "masks": [{"src": rules_mask, "name": "Rules"}, {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}]},
-                {"name": f"{primary_color_name} Frame", "src": src_primary, "masks": [{"src": rules_mask, "name": "Rules"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": main_frame_mask_src, "name": "Frame"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": main_border_mask_src, "name": "Border"}]}])
+            generated_frames.extend([
+                Layer(secondary_fn, src_secondary, ({"src": pinline_mask, "name": MASK_NAME_PINLINE}, RIGHT_HALF_MASK)),
+                Layer(primary_fn, src_primary, ({"src": pinline_mask, "name": MASK_NAME_PINLINE},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": type_mask, "name": MASK_NAME_TYPE},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": title_mask, "name": MASK_NAME_TITLE},)),
+                Layer(secondary_fn, src_secondary, ({"src": rules_mask, "name": MASK_NAME_RULES}, RIGHT_HALF_MASK)),
+                Layer(primary_fn, src_primary, ({"src": rules_mask, "name": MASK_NAME_RULES},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": main_frame_mask_src, "name": MASK_NAME_FRAME},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": main_border_mask_src, "name": MASK_NAME_BORDER},))])
         else: 
-            main_frame_layers.extend([
-                {"name": f"{primary_color_name} Frame", "src": src_primary, "masks": [{"src": pinline_mask, "name": "Pinline"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": type_mask, "name": "Type"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": title_mask, "name": "Title"}]},
-                {"name": f"{primary_color_name} Frame", "src": src_primary, "masks": [{"src": rules_mask, "name": "Rules"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": main_frame_mask_src, "name": "Frame"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": main_border_mask_src, "name": "Border"}]}])
-        generated_frames.extend(main_frame_layers)
+            generated_frames.extend([
+                Layer(primary_fn, src_primary, ({"src": pinline_mask, "name": MASK_NAME_PINLINE},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": type_mask, "name": MASK_NAME_TYPE},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": title_mask, "name": MASK_NAME_TITLE},)),
+                Layer(primary_fn, src_primary, ({"src": rules_mask, "name": MASK_NAME_RULES},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": main_frame_mask_src, "name": MASK_NAME_FRAME},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": main_border_mask_src, "name": MASK_NAME_BORDER},))])
         return generated_frames
 
-    def build_eighth_edition_frames(self, color_info: Union[Dict, List], card_data: Dict) -> List[Dict]:
+    def build_eighth_edition_frames(self, color_info: Union[Dict, List], card_data: Dict) -> List[Layer]:
         generated_frames = []
         if 'power' in card_data and 'toughness' in card_data:
-            pt_color_code, pt_name_prefix = None, None
-            if isinstance(color_info, dict):
-                code, name = color_info.get('code'), color_info.get('name')
-                if code == 'a': pt_color_code, pt_name_prefix = 'a', "Artifact"
-                elif code == 'm': pt_color_code, pt_name_prefix = 'm', "Gold"
-                elif code in ['w', 'u', 'b', 'r', 'g', 'c']: pt_color_code, pt_name_prefix = code, name
+            pt_color_code, pt_name_prefix = _classify_eighth_pt(color_info)
             if pt_color_code and pt_name_prefix:
                 pt_path = self.build_pt_frame_path(pt_color_code)
-                if pt_path and "/error_path" not in pt_path: generated_frames.append({"name": f"{pt_name_prefix} Power/Toughness", "src": pt_path, "masks": [], "bounds": {"height": 0.0839, "width": 0.2147, "x": 0.7227, "y": 0.8796}})
-        main_frame_layers = []
+                if pt_path and "/error_path" not in pt_path: generated_frames.append(Layer(f"{pt_name_prefix} Power/Toughness", pt_path, (), {"height": 0.0839, "width": 0.2147, "x": 0.7227, "y": 0.8796}))
+        single_color_masks = self._single_color_masks()
+        masks = dict(zip(("pinline", "type", "title", "rules", "frame", "border"), single_color_masks))
         if isinstance(color_info, list): 
             land_base_frame_info = color_info[0]
-            base_src = self.build_frame_path(land_base_frame_info['code'])
+            base_slot = (LAND_FRAME_NAME, self.build_frame_path(land_base_frame_info['code']))
+            base_src = base_slot[1]
             if len(color_info) > 2: 
-                first_cc, second_cc = color_info[1]['code'], color_info[2]['code']
-                first_cn, second_cn = color_info[1]['name'], color_info[2]['name']
-                main_frame_layers.extend([
-                    {"name": f"{second_cn} Land Frame", "src": self.build_land_frame_path(second_cc), "masks": [{"src": self.build_mask_path("pinline"), "name": "Pinline"}, {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}]},
-                    {"name": f"{first_cn} Land Frame", "src": self.build_land_frame_path(first_cc), "masks": [{"src": self.build_mask_path("pinline"), "name": "Pinline"}]},
-                    {"name": "Land Frame", "src": base_src, "masks": [{"src": self.build_mask_path("type"), "name": "Type"}]},
-                    {"name": "Land Frame", "src": base_src, "masks": [{"src": self.build_mask_path("title"), "name": "Title"}]},
-                    {"name": f"{second_cn} Land Frame", "src": self.build_land_frame_path(second_cc), "masks": [{"src": self.build_mask_path("rules"), "name": "Rules"}, {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}]},
-                    {"name": f"{first_cn} Land Frame", "src": self.build_land_frame_path(first_cc), "masks": [{"src": self.build_mask_path("rules"), "name": "Rules"}]},
-                    {"name": "Land Frame", "src": base_src, "masks": [{"src": self.build_mask_path("frame"), "name": "Frame"}]},
-                    {"name": "Land Frame", "src": base_src, "masks": [{"src": self.build_mask_path("border"), "name": "Border"}]}]
-                )
+                first_color, second_color = color_info[1], color_info[2]
+                slots = {"secondary": (_land_frame_name(second_color['name']), self.build_land_frame_path(second_color['code'])),
+                         "primary": (_land_frame_name(first_color['name']), self.build_land_frame_path(first_color['code'])),
+                         "type_title": base_slot, "frame_border": base_slot}
+                _extend_from_recipe(generated_frames, _TWO_COLOR_LAYER_RECIPE, slots, masks)
             elif len(color_info) > 1: 
                 mana_color = color_info[1]
-                main_frame_layers.extend([
-                    {"name": f"{mana_color['name']} Land Frame", "src": self.build_land_frame_path(mana_color['code']), "masks": [{"src": self.build_mask_path("pinline"), "name": "Pinline"}]},
-                    {"name": "Land Frame", "src": base_src, "masks": [{"src": self.build_mask_path("type"), "name": "Type"}]},
-                    {"name": "Land Frame", "src": base_src, "masks": [{"src": self.build_mask_path("title"), "name": "Title"}]},
-                    {"name": f"{mana_color['name']} Land Frame", "src": self.build_land_frame_path(mana_color['code']), "masks": [{"src": self.build_mask_path("rules"), "name": "Rules"}]},
-                    {"name": "Land Frame", "src": base_src, "masks": [{"src": self.build_mask_path("frame"), "name": "Frame"}]},
-                    {"name": "Land Frame", "src": base_src, "masks": [{"src": self.build_mask_path("border"), "name": "Border"}]}]
-                )
-            else: main_frame_layers.extend([{"name": "Land Frame", "src": base_src, "masks": [{"src": self.build_mask_path(mask_name), "name": mask_name.capitalize()}]} for mask_name in ["pinline", "type", "title", "rules", "frame", "border"]])
-        elif isinstance(color_info, dict): 
+                slots = {"primary": (_land_frame_name(mana_color['name']), self.build_land_frame_path(mana_color['code'])),
+                         "type_title": base_slot, "frame_border": base_slot}
+                _extend_from_recipe(generated_frames, _ONE_COLOR_LAYER_RECIPE, slots, masks)
+            else: generated_frames.extend(Layer(LAND_FRAME_NAME, base_src, (mask,)) for mask in single_color_masks)
+        elif isinstance(color_info, Mapping): 
             main_frame_color_code, main_frame_color_name = color_info.get('code'), color_info.get('name')
             if main_frame_color_code and main_frame_color_name:
                 main_frame_src = self.build_frame_path(main_frame_color_code)
-                main_frame_layers.extend([{"name": f"{main_frame_color_name} Frame", "src": main_frame_src, "masks": [{"src": self.build_mask_path(mask_name), "name": mask_name.capitalize()}]} for mask_name in ["pinline", "type", "title", "rules", "frame", "border"]])
-        generated_frames.extend(main_frame_layers)
+                generated_frames.extend(Layer(_frame_name(main_frame_color_name), main_frame_src, (mask,)) for mask in single_color_masks)
         return generated_frames
     
-    def build_seventh_edition_frames(self, color_info, card_data: Dict) -> List[Dict]:
+    def build_seventh_edition_frames(self, color_info, card_data: Dict) -> List[Layer]:
         frames = []
         common_masks = ["frame", "trim", "border"] 
+        pinline_mask, rules_mask = self._shared_mask("pinline"), self._shared_mask("rules")
         if isinstance(color_info, list): 
             land_frame = color_info[0]
+            land_frame_src = self.build_frame_path(land_frame['code']); land_frame_fn = _frame_name(land_frame['name'])
             if len(color_info) > 2: 
                 first_color, second_color = color_info[1], color_info[2]
-                frames.append({"name": f"{land_frame['name']} Frame", "src": self.build_frame_path(land_frame['code']), "masks": [{"src": self.build_mask_path("pinline"), "name": "Pinline"}]})
-                frames.append({"name": f"{second_color['name']} Land Frame", "src": self.build_land_frame_path(second_color['code']), "masks": [{"src": self.build_mask_path("rules"), "name": "Rules"}, {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}]})
-                frames.append({"name": f"{first_color['name']} Land Frame", "src": self.build_land_frame_path(first_color['code']), "masks": [{"src": self.build_mask_path("rules"), "name": "Rules"}]})
-                frames.extend([{"name": f"{land_frame['name']} Frame", "src": self.build_frame_path(land_frame['code']), "masks": [{"src": self.build_mask_path(mask_name), "name": mask_name.capitalize() if mask_name != "trim" else "Textbox Pinline"}]} for mask_name in common_masks])
+                frames.append(Layer(land_frame_fn, land_frame_src, (pinline_mask,)))
+                frames.append(Layer(_land_frame_name(second_color['name']), self.build_land_frame_path(second_color['code']), (rules_mask, RIGHT_HALF_MASK)))
+                frames.append(Layer(_land_frame_name(first_color['name']), self.build_land_frame_path(first_color['code']), (rules_mask,)))
+                frames.extend([Layer(land_frame_fn, land_frame_src, (self._shared_mask(mask_name),)) for mask_name in common_masks])
             elif len(color_info) > 1: 
                 color = color_info[1]
+                color_land_src = self.build_land_frame_path(color['code']); color_land_fn = _land_frame_name(color['name'])
                 # For single-color lands: pinline, rules, and trim use colored land frame; frame and border use generic land frame
-                frames.append({"name": f"{color['name']} Land Frame", "src": self.build_land_frame_path(color['code']), "masks": [{"src": self.build_mask_path("pinline"), "name": "Pinline"}]})
-                frames.append({"name": f"{color['name']} Land Frame", "src": self.build_land_frame_path(color['code']), "masks": [{"src": self.build_mask_path("rules"), "name": "Rules"}]})
-                frames.append({"name": f"{land_frame['name']} Frame", "src": self.build_frame_path(land_frame['code']), "masks": [{"src": self.build_mask_path("frame"), "name": "Frame"}]})
-                frames.append({"name": f"{color['name']} Land Frame", "src": self.build_land_frame_path(color['code']), "masks": [{"src": self.build_mask_path("trim"), "name": "Textbox Pinline"}]})
-                frames.append({"name": f"{land_frame['name']} Frame", "src": self.build_frame_path(land_frame['code']), "masks": [{"src": self.build_mask_path("border"), "name": "Border"}]})
-            else: frames = [{"name": f"{land_frame['name']} Frame", "src": self.build_frame_path(land_frame['code']), "masks": [{"src": self.build_mask_path(mask_name), "name": mask_name.capitalize() if mask_name != "trim" else "Textbox Pinline"}]} for mask_name in ["pinline", "rules"] + common_masks]
+                frames.append(Layer(color_land_fn, color_land_src, (pinline_mask,)))
+                frames.append(Layer(color_land_fn, color_land_src, (rules_mask,)))
+                frames.append(Layer(land_frame_fn, land_frame_src, (self._shared_mask("frame"),)))
+                frames.append(Layer(color_land_fn, color_land_src, (self._shared_mask("trim"),)))
+                frames.append(Layer(land_frame_fn, land_frame_src, (self._shared_mask("border"),)))
+            else: frames = [Layer(land_frame_fn, land_frame_src, (mask,)) for mask in self._single_color_masks()]
         else: 
             color_code, color_name = color_info['code'], color_info['name']
-            frames = [{"name": f"{color_name} Frame", "src": self.build_frame_path(color_code), "masks": [{"src": self.build_mask_path(mask_name), "name": mask_name.capitalize() if mask_name != "trim" else "Textbox Pinline"}]} for mask_name in ["pinline", "rules"] + common_masks]
+            frame_src = self.build_frame_path(color_code)
+            frames = [Layer(_frame_name(color_name), frame_src, (mask,)) for mask in self._single_color_masks()]
         return frames
 
-    def build_m15ub_frames(self, color_info: Union[Dict, List], card_data: Dict) -> List[Dict]:
+    def build_m15ub_frames(self, color_info: Union[Dict, List], card_data: Dict) -> List[Layer]:
         generated_frames = []; card_name_for_logging = card_data.get('name', 'Unknown Card'); type_line = card_data.get('type_line', ''); is_land_card = 'Land' in type_line
         if 'power' in card_data and 'toughness' in card_data:
-            pt_code_to_use, pt_name_prefix = None, "Unknown"
-            if 'Vehicle' in type_line: pt_code_to_use, pt_name_prefix = COLOR_CODE_MAP.get('V', {}).get('code'), COLOR_CODE_MAP.get('V', {}).get('name', "Vehicle")
-            elif isinstance(color_info, dict):
-                is_gold, is_artifact = color_info.get('is_gold', False), color_info.get('is_artifact', False)
-                is_true_colorless = color_info.get('code') == COLOR_CODE_MAP.get('C',{}).get('code') and not is_artifact
-                if is_gold: pt_code_to_use, pt_name_prefix = COLOR_CODE_MAP.get('M', {}).get('code'), COLOR_CODE_MAP.get('M', {}).get('name', "Multicolored")
-                elif is_artifact: pt_code_to_use, pt_name_prefix = COLOR_CODE_MAP.get('A', {}).get('code'), COLOR_CODE_MAP.get('A', {}).get('name', "Artifact")
-                elif is_true_colorless: pt_code_to_use, pt_name_prefix = COLOR_CODE_MAP.get('C', {}).get('code'), COLOR_CODE_MAP.get('C', {}).get('name', "Colorless")
-                elif color_info.get('code') in ['w','u','b','r','g']: pt_code_to_use, pt_name_prefix = color_info['code'], color_info['name']
+            pt_code_to_use, pt_name_prefix = _classify_pt(color_info, type_line)
             if pt_code_to_use:
-                pt_path_format_str = self.frame_config.get("pt_path_format"); pt_bounds_config = self.frame_config.get("pt_bounds"); pt_path = None 
+                pt_path_format_str = self._pt_fmt; pt_bounds_config = self._pt_bounds; pt_path = None 
                 if not pt_path_format_str:
                     raise FrameGenerationException(f"PT Error: pt_path_format missing in frame_config for {self.frame_type}", "Please check the frame config.")
                 else: pt_path = self.build_pt_frame_path(pt_code_to_use) 
-                if pt_path and pt_bounds_config and "/error_path" not in pt_path: generated_frames.append({"name": f"{pt_name_prefix} Power/Toughness", "src": pt_path, "masks": [], "bounds": pt_bounds_config})
+                if pt_path and pt_bounds_config and "/error_path" not in pt_path: generated_frames.append(Layer(f"{pt_name_prefix} Power/Toughness", pt_path, (), pt_bounds_config))
         is_legendary = 'Legendary' in type_line
         if self.legendary_crowns and is_legendary:
             primary_crown_color_code, secondary_crown_color_code = None, None; primary_crown_color_name, secondary_crown_color_name = "Legend", "Secondary"
-            if isinstance(color_info, dict) and color_info.get('is_gold') and color_info.get('component_colors'):
+            if isinstance(color_info, Mapping) and color_info.get('is_gold') and color_info.get('component_colors'):
                 components = color_info['component_colors']
                 if len(components) >= 1: primary_crown_color_code, primary_crown_color_name = components[0]['code'], components[0]['name']
                 if len(components) >= 2: secondary_crown_color_code, secondary_crown_color_name = components[1]['code'], components[1]['name']
-            elif isinstance(color_info, dict) and color_info.get('code'): primary_crown_color_code, primary_crown_color_name = color_info['code'], color_info['name']
+            elif isinstance(color_info, Mapping) and color_info.get('code'): primary_crown_color_code, primary_crown_color_name = color_info['code'], color_info['name']
             elif is_land_card and isinstance(color_info, list): 
-                if len(color_info) > 1 and isinstance(color_info[1], dict) and 'code' in color_info[1]: primary_crown_color_code, primary_crown_color_name = color_info[1]['code'], color_info[1]['name']
-                if len(color_info) > 2 and isinstance(color_info[2], dict) and 'code' in color_info[2]: secondary_crown_color_code, secondary_crown_color_name = color_info[2]['code'], color_info[2]['name']
-                elif not primary_crown_color_code and len(color_info) == 1 and isinstance(color_info[0], dict) and 'code' in color_info[0]: primary_crown_color_code, primary_crown_color_name = color_info[0]['code'], color_info[0]['name']
+                if len(color_info) > 1 and isinstance(color_info[1], Mapping) and 'code' in color_info[1]: primary_crown_color_code, primary_crown_color_name = color_info[1]['code'], color_info[1]['name']
+                if len(color_info) > 2 and isinstance(color_info[2], Mapping) and 'code' in color_info[2]: secondary_crown_color_code, secondary_crown_color_name = color_info[2]['code'], color_info[2]['name']
+                elif not primary_crown_color_code and len(color_info) == 1 and isinstance(color_info[0], Mapping) and 'code' in color_info[0]: primary_crown_color_code, primary_crown_color_name = color_info[0]['code'], color_info[0]['name']
             if primary_crown_color_code:
-                crown_src_path_format = self.frame_config.get("legend_crown_path_format_m15ub"); crown_bounds = self.frame_config.get("legend_crown_bounds"); crown_cover_src = self.frame_config.get("legend_crown_cover_src", "/img/black.png"); crown_cover_bounds = self.frame_config.get("legend_crown_cover_bounds")
+                crown_src_path_format = self._crown_fmt_m15ub; crown_bounds = self._crown_bounds; crown_cover_src = self._crown_cover_src; crown_cover_bounds = self._crown_cover_bounds
                 if crown_src_path_format and crown_bounds and crown_cover_src and crown_cover_bounds:
                     formatted_crown_path_secondary = self._format_path(crown_src_path_format, color_code_upper=secondary_crown_color_code.upper()) if secondary_crown_color_code else None
                     formatted_crown_path_primary = self._format_path(crown_src_path_format, color_code_upper=primary_crown_color_code.upper())
-                    if secondary_crown_color_code and formatted_crown_path_secondary and "/error_path" not in formatted_crown_path_secondary: generated_frames.append({"name": f"{secondary_crown_color_name} Legend Crown", "src": formatted_crown_path_secondary, "masks": [{"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}], "bounds": crown_bounds})
-                    if formatted_crown_path_primary and "/error_path" not in formatted_crown_path_primary: generated_frames.append({"name": f"{primary_crown_color_name} Legend Crown", "src": formatted_crown_path_primary, "masks": [], "bounds": crown_bounds}); generated_frames.append({"name": "Legend Crown Border Cover", "src": crown_cover_src, "masks": [], "bounds": crown_cover_bounds})
-        main_frame_layers = []; base_frame_path_fmt = self.frame_config.get("frame_path_format"); land_frame_path_fmt = self.frame_config.get("land_frame_path_format"); mask_path_fmt = self.frame_config.get("mask_path_format")
+                    if secondary_crown_color_code and formatted_crown_path_secondary and "/error_path" not in formatted_crown_path_secondary: generated_frames.append(Layer(f"{secondary_crown_color_name} Legend Crown", formatted_crown_path_secondary, (RIGHT_HALF_MASK,), crown_bounds))
+                    if formatted_crown_path_primary and "/error_path" not in formatted_crown_path_primary: generated_frames.append(Layer(f"{primary_crown_color_name} Legend Crown", formatted_crown_path_primary, (), crown_bounds)); generated_frames.append(Layer("Legend Crown Border Cover", crown_cover_src, (), crown_cover_bounds))
+        base_frame_path_fmt = self._base_frame_fmt; land_frame_path_fmt = self._land_frame_fmt; mask_path_fmt = self._mask_fmt
         if not all([base_frame_path_fmt, land_frame_path_fmt, mask_path_fmt]):
             raise FrameGenerationException(f"M15UB MainFrame: Essential path formats missing for '{card_name_for_logging}'.", "Please check the frame config.")
-        pinline_mask_src = self._format_path(mask_path_fmt, mask_name="Pinline"); type_mask_src = self._format_path(mask_path_fmt, mask_name="Type"); title_mask_src = self._format_path(mask_path_fmt, mask_name="Title"); rules_mask_src = self._format_path(mask_path_fmt, mask_name="Rules")
-        frame_mask_src = self.frame_config.get("frame_mask_name_for_main_frame_layer"); border_mask_src = self.frame_config.get("border_mask_name_for_main_frame_layer")
-        primary_color_code_main, secondary_color_code_main = None, None; primary_color_name_main, secondary_color_name_main = "Unknown", None; ttfb_code, ttfb_name = None, None 
-        base_codes = { k: COLOR_CODE_MAP.get(k, {}).get('code') for k in ['M', 'L', 'A', 'V', 'C'] }; base_names = { k: COLOR_CODE_MAP.get(k, {}).get('name') for k in ['M', 'L', 'A', 'V', 'C'] }
-        if is_land_card and isinstance(color_info, list): 
-            ttfb_code, ttfb_name = base_codes.get('L'), base_names.get('L', "Land")
-            if len(color_info) > 1 and isinstance(color_info[1], dict) and 'code' in color_info[1]: 
-                primary_color_code_main, primary_color_name_main = color_info[1]['code'], color_info[1]['name']
-                if len(color_info) > 2 and isinstance(color_info[2], dict) and 'code' in color_info[2]: secondary_color_code_main, secondary_color_name_main = color_info[2]['code'], color_info[2]['name']
-            elif len(color_info) == 1 and isinstance(color_info[0], dict) and 'code' in color_info[0]: primary_color_code_main, primary_color_name_main = color_info[0]['code'], color_info[0]['name']
-            else: logger.warning(f"Unexpected land color_info for '{card_name_for_logging}'. Defaulting."); primary_color_code_main, primary_color_name_main = base_codes.get('L'), base_names.get('L', "Land")
+        if is_land_card and isinstance(color_info, list):
+            primary_color_code_main, primary_color_name_main, secondary_color_code_main, secondary_color_name_main, ttfb_code, ttfb_name = _m15ub_land_main_colors(color_info, card_name_for_logging)
+        else: primary_color_code_main, primary_color_name_main, secondary_color_code_main, secondary_color_name_main, ttfb_code, ttfb_name = _M15UB_UNCLASSIFIED
         if not primary_color_code_main :
             raise FrameGenerationException(f"M15UB MainFrame: Primary color code MAIN missing for '{card_name_for_logging}'.", f"color_info: {color_info}")
         if not ttfb_code: logger.warning(f"M15UB MainFrame: TTFB code missing for '{card_name_for_logging}', falling back to primary. color_info: {color_info}"); ttfb_code, ttfb_name = primary_color_code_main, primary_color_name_main 
         src_pinline_rules = ""; src_type_title = ""; src_frame_border = ""
         if is_land_card:
-            if primary_color_code_main != base_codes.get('L'): src_pinline_rules = self._format_path(land_frame_path_fmt, color_code=primary_color_code_main); src_type_title = src_pinline_rules 
-            else: src_pinline_rules = self._format_path(base_frame_path_fmt, color_code=primary_color_code_main); src_type_title = src_pinline_rules 
-            src_frame_border = self._format_path(base_frame_path_fmt, color_code=base_codes.get('L')) 
-        else: src_pinline_rules = self._format_path(base_frame_path_fmt, color_code=primary_color_code_main); src_type_title = self._format_path(base_frame_path_fmt, color_code=ttfb_code); src_frame_border = src_type_title 
+            if primary_color_code_main != L_CODE: src_pinline_rules = _format_color_path(land_frame_path_fmt, primary_color_code_main); src_type_title = src_pinline_rules 
+            else: src_pinline_rules = _format_color_path(base_frame_path_fmt, primary_color_code_main); src_type_title = src_pinline_rules 
+            src_frame_border = _format_color_path(base_frame_path_fmt, L_CODE) 
+        else: src_pinline_rules = _format_color_path(base_frame_path_fmt, primary_color_code_main); src_type_title = _format_color_path(base_frame_path_fmt, ttfb_code); src_frame_border = src_type_title 
         if "/error_path" in src_pinline_rules or "/error_path" in src_type_title or "/error_path" in src_frame_border :
             raise FrameGenerationException(f"M15UB MainFrame: Error in critical frame paths for '{card_name_for_logging}'.", "Please check the frame config.")
-        type_title_name_prefix = primary_color_name_main if (is_land_card and primary_color_code_main != base_codes.get('L')) else ttfb_name
+        type_title_name_prefix = primary_color_name_main if (is_land_card and primary_color_code_main != L_CODE) else ttfb_name
+        masks = self._m15ub_recipe_masks()
+        slots = {"primary": (_frame_name(primary_color_name_main), src_pinline_rules), "type_title": (_frame_name(type_title_name_prefix), src_type_title), "frame_border": (_frame_name(ttfb_name), src_frame_border)}
         if secondary_color_code_main: 
-            src_secondary_pinline_rules = self._format_path(land_frame_path_fmt if is_land_card else base_frame_path_fmt, color_code=secondary_color_code_main)
-            if "/error_path" not in src_secondary_pinline_rules: main_frame_layers.extend([ {"name": f"{secondary_color_name_main} Frame", "src": src_secondary_pinline_rules, "masks": [{"src": pinline_mask_src, "name": "Pinline"}, {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}]}, {"name": f"{primary_color_name_main} Frame", "src": src_pinline_rules, "masks": [{"src": pinline_mask_src, "name": "Pinline"}]}, {"name": f"{ttfb_name} Frame", "src": src_frame_border, "masks": [{"src": type_mask_src, "name": "Type"}]}, {"name": f"{ttfb_name} Frame", "src": src_frame_border, "masks": [{"src": title_mask_src, "name": "Title"}]}, {"name": f"{secondary_color_name_main} Frame", "src": src_secondary_pinline_rules, "masks": [{"src": rules_mask_src, "name": "Rules"}, {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}]}, {"name": f"{primary_color_name_main} Frame", "src": src_pinline_rules, "masks": [{"src": rules_mask_src, "name": "Rules"}]}, {"name": f"{ttfb_name} Frame", "src": src_frame_border, "masks": [{"src": frame_mask_src, "name": "Frame"}]}, {"name": f"{ttfb_name} Frame", "src": src_frame_border, "masks": [{"src": border_mask_src, "name": "Border"}]}])
+            src_secondary_pinline_rules = _format_color_path(land_frame_path_fmt if is_land_card else base_frame_path_fmt, secondary_color_code_main)
+            if "/error_path" not in src_secondary_pinline_rules:
+                slots["secondary"] = (_frame_name(secondary_color_name_main), src_secondary_pinline_rules); slots["type_title"] = slots["frame_border"]
+                _extend_from_recipe(generated_frames, _TWO_COLOR_LAYER_RECIPE, slots, masks)
             else:
                 logger.warning(f"M15UB MainFrame: Error generating secondary path for '{card_name_for_logging}'. Falling back to primary layers.")
-                main_frame_layers.extend([ {"name": f"{primary_color_name_main} Frame", "src": src_pinline_rules, "masks": [{"src": pinline_mask_src, "name": "Pinline"}]}, {"name": f"{type_title_name_prefix} Frame", "src": src_type_title, "masks": [{"src": type_mask_src, "name": "Type"}]}, {"name": f"{type_title_name_prefix} Frame", "src": src_type_title, "masks": [{"src": title_mask_src, "name": "Title"}]}, {"name": f"{primary_color_name_main} Frame", "src": src_pinline_rules, "masks": [{"src": rules_mask_src, "name": "Rules"}]}, {"name": f"{ttfb_name} Frame", "src": src_frame_border, "masks": [{"src": frame_mask_src, "name": "Frame"}]}, {"name": f"{ttfb_name} Frame", "src": src_frame_border, "masks": [{"src": border_mask_src, "name": "Border"}]}])
+                _extend_from_recipe(generated_frames, _ONE_COLOR_LAYER_RECIPE, slots, masks)
         else: 
-            main_frame_layers.extend([ {"name": f"{primary_color_name_main} Frame", "src": src_pinline_rules, "masks": [{"src": pinline_mask_src, "name": "Pinline"}]}, {"name": f"{type_title_name_prefix} Frame", "src": src_type_title, "masks": [{"src": type_mask_src, "name": "Type"}]}, {"name": f"{type_title_name_prefix} Frame", "src": src_type_title, "masks": [{"src": title_mask_src, "name": "Title"}]}, {"name": f"{primary_color_name_main} Frame", "src": src_pinline_rules, "masks": [{"src": rules_mask_src, "name": "Rules"}]}, {"name": f"{ttfb_name} Frame", "src": src_frame_border, "masks": [{"src": frame_mask_src, "name": "Frame"}]}, {"name": f"{ttfb_name} Frame", "src": src_frame_border, "masks": [{"src": border_mask_src, "name": "Border"}]}])
-        generated_frames.extend(main_frame_layers)
+            _extend_from_recipe(generated_frames, _ONE_COLOR_LAYER_RECIPE, slots, masks)
         return generated_frames
     # --- End of Pasted Frame Building Methods ---
 
-    def build_modern_frames(self, color_info: Union[Dict, List], card_data: Dict) -> List[Dict]:
+    def build_modern_frames(self, color_info: Union[Dict, List], card_data: Dict) -> List[Layer]:
         generated_frames = []
         card_name_for_logging = card_data.get('name', 'Unknown Card')
         is_legendary = 'Legendary' in card_data.get('type_line', '')
@@ -640,59 +1110,57 @@ class CardBuilder:
             primary_crown_color_code, secondary_crown_color_code = None, None
             primary_crown_color_name, secondary_crown_color_name = "Legend", "Secondary"
 
-            if isinstance(color_info, dict) and color_info.get('is_gold') and color_info.get('component_colors'):
+            if isinstance(color_info, Mapping) and color_info.get('is_gold') and color_info.get('component_colors'):
                 components = color_info['component_colors']
                 if len(components) >= 1: primary_crown_color_code, primary_crown_color_name = components[0]['code'], components[0]['name']
                 if len(components) >= 2: secondary_crown_color_code, secondary_crown_color_name = components[1]['code'], components[1]['name']
-            elif isinstance(color_info, dict) and color_info.get('code'): 
+            elif isinstance(color_info, Mapping) and color_info.get('code'): 
                 primary_crown_color_code, primary_crown_color_name = color_info['code'], color_info['name']
             
             if primary_crown_color_code:
-                crown_path_format = self.frame_config.get("legend_crown_path_format") 
-                crown_bounds = self.frame_config.get("legend_crown_bounds")
-                cover_bounds = self.frame_config.get("legend_crown_cover_bounds") 
+                crown_path_format, crown_bounds, cover_bounds = self._crown_fmt, self._crown_bounds, self._crown_cover_bounds
 
                 if crown_path_format and crown_bounds and cover_bounds:
                     if secondary_crown_color_code:
-                        generated_frames.append({"name": f"{secondary_crown_color_name} Legend Crown", "src": self._format_path(crown_path_format, color_code=secondary_crown_color_code.lower()), "masks": [{"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}], "bounds": crown_bounds})
-                    generated_frames.append({"name": f"{primary_crown_color_name} Legend Crown", "src": self._format_path(crown_path_format, color_code=primary_crown_color_code.lower()), "masks": [], "bounds": crown_bounds})
-                    generated_frames.append({"name": "Legend Crown Border Cover", "src": "/img/black.png", "masks": [], "bounds": cover_bounds})
+                        generated_frames.append(Layer(f"{secondary_crown_color_name} Legend Crown", self._format_path(crown_path_format, color_code=secondary_crown_color_code.lower()), (RIGHT_HALF_MASK,), crown_bounds))
+                    generated_frames.append(Layer(f"{primary_crown_color_name} Legend Crown", self._format_path(crown_path_format, color_code=primary_crown_color_code.lower()), (), crown_bounds))
+                    generated_frames.append(Layer("Legend Crown Border Cover", "/img/black.png", (), cover_bounds))
             elif is_legendary: logger.warning(f"Could not determine color for M15 legendary crown on '{card_name_for_logging}'.")
 
         if 'power' in card_data and 'toughness' in card_data:
             pt_code, pt_name_prefix = None, "Unknown"
-            if isinstance(color_info, dict) and color_info.get('is_gold'): pt_code, pt_name_prefix = COLOR_CODE_MAP['M']['code'], COLOR_CODE_MAP['M']['name']
-            elif isinstance(color_info, dict) and color_info.get('code'): pt_code, pt_name_prefix = color_info['code'], color_info['name']
+            if isinstance(color_info, Mapping) and color_info.get('is_gold'): pt_code, pt_name_prefix = M_CODE, M_NAME
+            elif isinstance(color_info, Mapping) and color_info.get('code'): pt_code, pt_name_prefix = color_info['code'], color_info['name']
             if pt_code:
                 pt_path = self.build_pt_frame_path(pt_code) 
-                pt_bounds = self.frame_config.get("pt_bounds")
-                if pt_path and pt_bounds and "/error_path" not in pt_path: generated_frames.append({"name": f"{pt_name_prefix} Power/Toughness", "src": pt_path, "masks": [], "bounds": pt_bounds})
+                pt_bounds = self._pt_bounds
+                if pt_path and pt_bounds and "/error_path" not in pt_path: generated_frames.append(Layer(f"{pt_name_prefix} Power/Toughness", pt_path, (), pt_bounds))
 
-        main_frame_layers = []; base_frame_path_fmt = self.frame_config.get("frame_path_format"); mask_path_fmt = self.frame_config.get("mask_path_format")
-        land_frame_path_fmt = self.frame_config.get("land_frame_path_format")
-        main_frame_mask_src = self.frame_config.get("frame_mask_name_for_main_frame_layer"); main_border_mask_src = self.frame_config.get("border_mask_name_for_main_frame_layer")
+        base_frame_path_fmt = self._base_frame_fmt; mask_path_fmt = self._mask_fmt
+        land_frame_path_fmt = self._land_frame_fmt
+        main_frame_mask_src = self._frame_mask_src; main_border_mask_src = self._border_mask_src
         if not all([base_frame_path_fmt, mask_path_fmt, main_frame_mask_src, main_border_mask_src]): return generated_frames
 
         primary_color_code, primary_color_name = None, "Unknown"; secondary_color_code, secondary_color_name = None, None
-        base_multicolor_code = COLOR_CODE_MAP['M']['code']; base_multicolor_name = COLOR_CODE_MAP['M']['name']
+        base_multicolor_code = M_CODE; base_multicolor_name = M_NAME
         ttfb_code, ttfb_name = None, None 
         
         is_land = isinstance(color_info, list)
         if is_land:
-            ttfb_frame_code, ttfb_frame_name = COLOR_CODE_MAP['L']['code'], COLOR_CODE_MAP['L']['name']
+            ttfb_frame_code, ttfb_frame_name = L_CODE, L_NAME
             if len(color_info) > 1 and color_info[1]['code'] == 'm':
-                ttfb_code, ttfb_name = COLOR_CODE_MAP['M']['code'], COLOR_CODE_MAP['M']['name']
+                ttfb_code, ttfb_name = M_CODE, M_NAME
             else:
-                ttfb_code, ttfb_name = COLOR_CODE_MAP['L']['code'], COLOR_CODE_MAP['L']['name']
+                ttfb_code, ttfb_name = L_CODE, L_NAME
             
             if len(color_info) > 1: primary_color_code, primary_color_name = color_info[1]['code'], color_info[1]['name']
             if len(color_info) > 2: secondary_color_code, secondary_color_name = color_info[2]['code'], color_info[2]['name']
             if not primary_color_code and len(color_info) == 1: primary_color_code, primary_color_name = color_info[0]['code'], color_info[0]['name']
         else:
             # This part is for non-land cards, which was missing
-            if isinstance(color_info, dict):
+            if isinstance(color_info, Mapping):
                 if color_info.get('is_gold'):
-                    primary_color_code, primary_color_name = COLOR_CODE_MAP['M']['code'], COLOR_CODE_MAP['M']['name']
+                    primary_color_code, primary_color_name = M_CODE, M_NAME
                     ttfb_code, ttfb_name = primary_color_code, primary_color_name
                     if color_info.get('component_colors'):
                         components = color_info['component_colors']
@@ -705,79 +1173,78 @@ class CardBuilder:
 
         if not primary_color_code or not ttfb_code: return generated_frames
         
-        src_primary = self._format_path(base_frame_path_fmt, color_code=primary_color_code)
-        src_secondary = self._format_path(base_frame_path_fmt, color_code=secondary_color_code) if secondary_color_code else None
-        src_ttfb = self._format_path(base_frame_path_fmt, color_code=ttfb_code)
-        pinline_mask = self._format_path(mask_path_fmt, mask_name="pinline")
-        type_mask = self._format_path(mask_path_fmt, mask_name="type")
-        title_mask = self._format_path(mask_path_fmt, mask_name="title")
-        rules_mask = self._format_path(mask_path_fmt, mask_name="rules")
-        frame_mask = self._format_path(mask_path_fmt, mask_name="frame")
-        border_mask = self._format_path(mask_path_fmt, mask_name="border")
+        src_primary = _format_color_path(base_frame_path_fmt, primary_color_code)
+        src_secondary = _format_color_path(base_frame_path_fmt, secondary_color_code) if secondary_color_code else None
+        src_ttfb = _format_color_path(base_frame_path_fmt, ttfb_code)
+        pinline_mask = self._mask_srcs["pinline"]
+        type_mask = self._mask_srcs["type"]
+        title_mask = self._mask_srcs["title"]
+        rules_mask = self._mask_srcs["rules"]
+        frame_mask = self._mask_srcs["frame"]
+        border_mask = self._mask_srcs["border"]
+        primary_fn, ttfb_fn = _frame_name(primary_color_name), _frame_name(ttfb_name)
+        secondary_fn = _frame_name(secondary_color_name) if secondary_color_name else None
+        primary_land_fn = _land_frame_name(primary_color_name)
+        secondary_land_fn = _land_frame_name(secondary_color_name) if secondary_color_name else None
 
         if is_land:
-            src_frame_border = self._format_path(base_frame_path_fmt, color_code=ttfb_frame_code)
+            src_frame_border = _format_color_path(base_frame_path_fmt, ttfb_frame_code)
+            ttfb_frame_fn = _frame_name(ttfb_frame_name)
             if secondary_color_code and land_frame_path_fmt:
-                src_land_secondary = self._format_path(land_frame_path_fmt, color_code=secondary_color_code)
-                src_land_primary = self._format_path(land_frame_path_fmt, color_code=primary_color_code)
-                main_frame_layers.extend([
-                    {"name": f"{secondary_color_name} Land Frame", "src": src_land_secondary, "masks": [{"src": pinline_mask, "name": "Pinline"}, {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}]},
-                    {"name": f"{primary_color_name} Land Frame", "src": src_land_primary, "masks": [{"src": pinline_mask, "name": "Pinline"}]},
-                    {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": type_mask, "name": "Type"}]},
-                    {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": title_mask, "name": "Title"}]},
-                    {"name": f"{secondary_color_name} Land Frame", "src": src_land_secondary, "masks": [{"src": rules_mask, "name": "Rules"}, {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}]},
-                    {"name": f"{primary_color_name} Land Frame", "src": src_land_primary, "masks": [{"src": rules_mask, "name": "Rules"}]},
-                    {"name": f"{ttfb_frame_name} Frame", "src": src_frame_border, "masks": [{"src": frame_mask, "name": "Frame"}]},
-                    {"name": f"{ttfb_frame_name} Frame", "src": src_frame_border, "masks": [{"src": border_mask, "name": "Border"}]}]
+                src_land_secondary = _format_color_path(land_frame_path_fmt, secondary_color_code)
+                src_land_primary = _format_color_path(land_frame_path_fmt, primary_color_code)
+                generated_frames.extend([
+                    Layer(secondary_land_fn, src_land_secondary, ({"src": pinline_mask, "name": MASK_NAME_PINLINE}, RIGHT_HALF_MASK)),
+                    Layer(primary_land_fn, src_land_primary, ({"src": pinline_mask, "name": MASK_NAME_PINLINE},)),
+                    Layer(ttfb_fn, src_ttfb, ({"src": type_mask, "name": MASK_NAME_TYPE},)),
+                    Layer(ttfb_fn, src_ttfb, ({"src": title_mask, "name": MASK_NAME_TITLE},)),
+                    Layer(secondary_land_fn, src_land_secondary, ({"src": rules_mask, "name": MASK_NAME_RULES}, RIGHT_HALF_MASK)),
+                    Layer(primary_land_fn, src_land_primary, ({"src": rules_mask, "name": MASK_NAME_RULES},)),
+                    Layer(ttfb_frame_fn, src_frame_border, ({"src": frame_mask, "name": MASK_NAME_FRAME},)),
+                    Layer(ttfb_frame_fn, src_frame_border, ({"src": border_mask, "name": MASK_NAME_BORDER},))]
                 )
             elif primary_color_code and land_frame_path_fmt:
                 if primary_color_code in ['m', 'l']:
-                    src_land_primary = self._format_path(base_frame_path_fmt, color_code=primary_color_code)
+                    src_land_primary = _format_color_path(base_frame_path_fmt, primary_color_code)
                 else:
-                    src_land_primary = self._format_path(land_frame_path_fmt, color_code=primary_color_code)
-                main_frame_layers.extend([
-                    {"name": f"{primary_color_name} Land Frame", "src": src_land_primary, "masks": [{"src": pinline_mask, "name": "Pinline"}]},
-                    {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": type_mask, "name": "Type"}]},
-                    {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": title_mask, "name": "Title"}]},
-                    {"name": f"{primary_color_name} Land Frame", "src": src_land_primary, "masks": [{"src": rules_mask, "name": "Rules"}]},
-                    {"name": f"{ttfb_frame_name} Frame", "src": src_frame_border, "masks": [{"src": frame_mask, "name": "Frame"}]},
-                    {"name": f"{ttfb_frame_name} Frame", "src": src_frame_border, "masks": [{"src": border_mask, "name": "Border"}]}]
+                    src_land_primary = _format_color_path(land_frame_path_fmt, primary_color_code)
+                generated_frames.extend([
+                    Layer(primary_land_fn, src_land_primary, ({"src": pinline_mask, "name": MASK_NAME_PINLINE},)),
+                    Layer(ttfb_fn, src_ttfb, ({"src": type_mask, "name": MASK_NAME_TYPE},)),
+                    Layer(ttfb_fn, src_ttfb, ({"src": title_mask, "name": MASK_NAME_TITLE},)),
+                    Layer(primary_land_fn, src_land_primary, ({"src": rules_mask, "name": MASK_NAME_RULES},)),
+                    Layer(ttfb_frame_fn, src_frame_border, ({"src": frame_mask, "name": MASK_NAME_FRAME},)),
+                    Layer(ttfb_frame_fn, src_frame_border, ({"src": border_mask, "name": MASK_NAME_BORDER},))]
                 )
         elif secondary_color_code and src_secondary and "/error_path" not in src_secondary: 
-            main_frame_layers.extend([
-                {"name": f"{secondary_color_name} Frame", "src": src_secondary, "masks": [{"src": pinline_mask, "name": "Pinline"}, {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}]},
-                {"name": f"{primary_color_name} Frame", "src": src_primary, "masks": [{"src": pinline_mask, "name": "Pinline"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": type_mask, "name": "Type"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": title_mask, "name": "Title"}]},
-                {"name": f"{secondary_color_name} Frame", "src": src_secondary, "masks": [{"src": rules_mask, "name": "Rules"}, {"src": "/img/frames/maskRightHalf.png", "name": "Right Half"}]},
-                {"name": f"{primary_color_name} Frame", "src": src_primary, "masks": [{"src": rules_mask, "name": "Rules"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": frame_mask, "name": "Frame"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": border_mask, "name": "Border"}]}]
+            generated_frames.extend([
+                Layer(secondary_fn, src_secondary, ({"src": pinline_mask, "name": MASK_NAME_PINLINE}, RIGHT_HALF_MASK)),
+                Layer(primary_fn, src_primary, ({"src": pinline_mask, "name": MASK_NAME_PINLINE},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": type_mask, "name": MASK_NAME_TYPE},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": title_mask, "name": MASK_NAME_TITLE},)),
+                Layer(secondary_fn, src_secondary, ({"src": rules_mask, "name": MASK_NAME_RULES}, RIGHT_HALF_MASK)),
+                Layer(primary_fn, src_primary, ({"src": rules_mask, "name": MASK_NAME_RULES},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": frame_mask, "name": MASK_NAME_FRAME},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": border_mask, "name": MASK_NAME_BORDER},))]
             )
         else: 
-            main_frame_layers.extend([
-                {"name": f"{primary_color_name} Frame", "src": src_primary, "masks": [{"src": pinline_mask, "name": "Pinline"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": type_mask, "name": "Type"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": title_mask, "name": "Title"}]},
-                {"name": f"{primary_color_name} Frame", "src": src_primary, "masks": [{"src": rules_mask, "name": "Rules"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": frame_mask, "name": "Frame"}]},
-                {"name": f"{ttfb_name} Frame", "src": src_ttfb, "masks": [{"src": border_mask, "name": "Border"}]}]
+            generated_frames.extend([
+                Layer(primary_fn, src_primary, ({"src": pinline_mask, "name": MASK_NAME_PINLINE},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": type_mask, "name": MASK_NAME_TYPE},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": title_mask, "name": MASK_NAME_TITLE},)),
+                Layer(primary_fn, src_primary, ({"src": rules_mask, "name": MASK_NAME_RULES},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": frame_mask, "name": MASK_NAME_FRAME},)),
+                Layer(ttfb_fn, src_ttfb, ({"src": border_mask, "name": MASK_NAME_BORDER},))]
             )
-        generated_frames.extend(main_frame_layers)
         return generated_frames
     
     def build_card_data(self, card_name: str, card_data: Dict, color_info,
                             is_basic_land_fetch_mode: bool = False,
                             basic_land_type_override: Optional[str] = None) -> Dict:
         
-            logger.debug(f"build_card_data for '{card_name}', frame_type '{self.frame_type}'. Upscale Art: {self.upscale_art}, Auto-fit Art: {self.auto_fit_art}")
+            logger.debug("build_card_data for '%s', frame_type '%s'. Upscale Art: %s, Auto-fit Art: %s", card_name, self.frame_type, self.upscale_art, self.auto_fit_art)
             
-            frames_for_card_obj = []
-            if self.frame_type == "8th": frames_for_card_obj = self.build_eighth_edition_frames(color_info, card_data)
-            elif self.frame_type == "m15": frames_for_card_obj = self.build_m15_frames(color_info, card_data)
-            elif self.frame_type == "m15ub": frames_for_card_obj = self.build_m15ub_frames(color_info, card_data)
-            elif self.frame_type == "modern": frames_for_card_obj = self.build_modern_frames(color_info, card_data)
-            else: frames_for_card_obj = self.build_seventh_edition_frames(color_info, card_data)
+            frames_for_card_obj = self._build_frames(color_info, card_data)
             
             mana_symbols = []
             if isinstance(color_info, list) or self.frame_config.get("version_string", "") == "m15EighthSnow": 
@@ -807,94 +1274,98 @@ class CardBuilder:
             rarity_from_scryfall = card_data.get('rarity', 'c')
             rarity_code_for_symbol = RARITY_MAP.get(rarity_from_scryfall, rarity_from_scryfall)
     
-            art_crop_url = "" 
-            if 'image_uris' in card_data and 'art_crop' in card_data['image_uris']: art_crop_url = card_data['image_uris']['art_crop']
-            elif 'card_faces' in card_data and card_data['card_faces']:
-                for face in card_data['card_faces']:
-                    if 'image_uris' in face and 'art_crop' in face['image_uris']: 
-                        art_crop_url = face['image_uris']['art_crop']; break
+            art_crop_url = _art_crop_url(card_data)
             if not art_crop_url:
                 raise DataProcessingException("Missing art_crop URL", f"No art_crop URL found for {scryfall_card_name}")
-            art_x = self.frame_config.get("art_x", 0.0)
-            art_y = self.frame_config.get("art_y", 0.0)
-            art_zoom = self.frame_config.get("art_zoom", 1.0)
-            art_rotate = self.frame_config.get("art_rotate", "0")
+            art_x, art_y, art_zoom, art_rotate = self._art_defaults
             
             final_art_source_url = art_crop_url
+            pending_upscale: Optional[Future] = None
             hosted_original_art_url: Optional[str] = None
             hosted_upscaled_art_url: Optional[str] = None
-            original_art_bytes_for_pipeline: Optional[bytes] = None
+            original_art_for_pipeline: Optional[Union[bytes, Path]] = None
             original_image_mime_type: Optional[str] = None
             
             _, initial_ext_guess = os.path.splitext(art_crop_url.split('?')[0])
-            if not initial_ext_guess or initial_ext_guess.lower() not in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
+            if not initial_ext_guess or initial_ext_guess.lower() not in _HOSTED_ART_EXTENSIONS:
                 initial_ext_guess = ".jpg"
             original_image_actual_ext: str = initial_ext_guess.lower()
             
-            sanitized_card_name = sanitize_for_filename(scryfall_card_name)
-            set_code_sanitized = sanitize_for_filename(set_code_from_scryfall)
-            collector_number_sanitized = sanitize_for_filename(collector_number_from_scryfall)
+            # Base filename shared by every art asset of this printing; extensions/suffixes are appended.
+            set_key = sanitize_for_filename(set_code_from_scryfall)
+            asset_key = _asset_key(scryfall_card_name, set_code_from_scryfall, collector_number_from_scryfall)
             
             # --- Art Processing Pipeline ---
             # Only run if an output action is specified
             if self.output_dir or self.upload_to_server:
                 # 1. Get original art bytes (from server or Scryfall)
                 if self.upload_to_server:
-                    possible_extensions = [original_image_actual_ext] + [ext for ext in ['.jpg', '.png', '.jpeg', '.webp', '.gif'] if ext != original_image_actual_ext]
-                    for ext_try in possible_extensions:
-                        base_filename_check = f"{sanitized_card_name}_{set_code_sanitized}_{collector_number_sanitized}{ext_try}"
-                        potential_url = f"{self.image_server_base_url.rstrip('/')}{self.image_server_path_prefix}/original/{base_filename_check}"
-                        if self._check_if_file_exists_on_server(potential_url):
-                            temp_bytes = self._fetch_image_bytes(potential_url, "server original")
-                            if temp_bytes:
-                                original_art_bytes_for_pipeline = temp_bytes
-                                hosted_original_art_url = potential_url
-                                mime, ext = self._get_image_mime_type_and_extension(temp_bytes)
-                                if ext: original_image_actual_ext = ext
-                                if mime: original_image_mime_type = mime
-                                break
+                    base_url_check = f"{self._image_root_url}/original/{asset_key}"
+                    hosted_original = self._fetch_hosted_original(base_url_check, set_key, original_image_actual_ext)
+                    if hosted_original:
+                        hosted_original_art_url, ext_hit, (original_art_for_pipeline, mime, ext) = hosted_original
+                        self._ext_freq[set_key][ext_hit] += 1
+                        if ext: original_image_actual_ext = ext
+                        if mime: original_image_mime_type = mime
+                else:
+                    local_original = self._local_original(asset_key)
+                    if local_original:
+                        # Saved by an earlier run: read it back rather than downloading and rewriting the same art.
+                        original_art_for_pipeline = local_original.read_bytes()
+                        hosted_original_art_url = f"{self._image_root_url}/original/{local_original.name}"
+                        mime, ext = self._get_image_mime_type_and_extension(original_art_for_pipeline)
+                        if ext: original_image_actual_ext = ext
+                        if mime: original_image_mime_type = mime
+                        logger.info(f"Using original art saved earlier: {local_original}")
                 
-                if not original_art_bytes_for_pipeline and art_crop_url:
-                    original_art_bytes_for_pipeline = self._fetch_image_bytes(art_crop_url, "Scryfall original")
-                    if original_art_bytes_for_pipeline:
-                        mime, ext = self._get_image_mime_type_and_extension(original_art_bytes_for_pipeline)
+                if not original_art_for_pipeline and art_crop_url:
+                    original_art_for_pipeline = self._fetch_image_bytes(art_crop_url, "Scryfall original")
+                    if original_art_for_pipeline:
+                        mime, ext = self._get_image_mime_type_and_extension(original_art_for_pipeline)
                         if ext: original_image_actual_ext = ext
                         if mime: original_image_mime_type = mime
     
                 # 2. If we have bytes, save/upload the original and calculate auto-fit
-                if original_art_bytes_for_pipeline:
-                    if not hosted_original_art_url:
-                        filename_to_output = f"{sanitized_card_name}_{set_code_sanitized}_{collector_number_sanitized}{original_image_actual_ext}"
-                        self._output_image(original_art_bytes_for_pipeline, "original", filename_to_output)
-                        hosted_original_art_url = f"{self.image_server_base_url.rstrip('/')}{self.image_server_path_prefix}/original/{filename_to_output}"
-    
-                    if self.auto_fit_art:
-                        auto_fit_params = self._calculate_auto_fit_art_params_from_data(original_art_bytes_for_pipeline, hosted_original_art_url)
-                        if auto_fit_params:
-                            art_x, art_y, art_zoom = auto_fit_params["artX"], auto_fit_params["artY"], auto_fit_params["artZoom"]
-                            logger.info(f"Auto-Fit applied for {scryfall_card_name}: X={art_x:.4f}, Y={art_y:.4f}, Zoom={art_zoom:.4f}")
+                if original_art_for_pipeline:
+                    try:
+                        if not hosted_original_art_url:
+                            filename_to_output = f"{asset_key}{original_image_actual_ext}"
+                            self._output_image(original_art_for_pipeline, "original", filename_to_output, original_image_mime_type)
+                            hosted_original_art_url = f"{self._image_root_url}/original/{filename_to_output}"
+        
+                        if self.auto_fit_art:
+                            auto_fit_params = self._calculate_auto_fit_art_params_from_data(original_art_for_pipeline, hosted_original_art_url)
+                            if auto_fit_params:
+                                art_x, art_y, art_zoom = auto_fit_params["artX"], auto_fit_params["artY"], auto_fit_params["artZoom"]
+                                logger.info(f"Auto-Fit applied for {scryfall_card_name}: X={art_x:.4f}, Y={art_y:.4f}, Zoom={art_zoom:.4f}")
+                    finally:
+                        # Server originals are streamed to a temp file that is only needed up to here.
+                        if isinstance(original_art_for_pipeline, Path): original_art_for_pipeline.unlink(missing_ok=True)
     
                 # 3. Upscale if requested
-                if self.upscale_art and original_art_bytes_for_pipeline and self.ilaria_upscaler_base_url:
-                    upscaled_dir = f"{sanitize_for_filename(self.upscaler_model_name)}-{self.upscaler_outscale_factor}x"
-                    upscaled_filename_check = f"{sanitized_card_name}_{set_code_sanitized}_{collector_number_sanitized}.png"
-                    expected_upscaled_url = f"{self.image_server_base_url.rstrip('/')}{self.image_server_path_prefix}/{upscaled_dir}/{upscaled_filename_check}"
+                if self.upscale_art and original_art_for_pipeline and self.ilaria_upscaler_base_url:
+                    upscaled_dir = self._upscaled_dir
+                    upscaled_filename_check = f"{asset_key}.png"
+                    expected_upscaled_url = f"{self._image_root_url}/{upscaled_dir}/{upscaled_filename_check}"
                     
-                    # Check if upscaled version already exists
-                    if (self.upload_to_server and self._check_if_file_exists_on_server(expected_upscaled_url)) or \
-                       (self.output_dir and (Path(self.output_dir) / self.image_server_path_prefix.strip('/') / upscaled_dir / upscaled_filename_check).exists()):
+                    # Check if upscaled version already exists; the upscaler may have returned a non-PNG, so all extensions are probed at once
+                    existing_upscaled_url = self._first_existing_url(expected_upscaled_url[:-len(".png")], _UPSCALED_ART_EXTENSIONS) if self.upload_to_server else None
+                    if existing_upscaled_url or \
+                       (self._local_art_root and (self._local_art_root / upscaled_dir / upscaled_filename_check).exists()):
                         logger.info(f"Found existing upscaled art for '{scryfall_card_name}'.")
-                        hosted_upscaled_art_url = expected_upscaled_url
+                        hosted_upscaled_art_url = existing_upscaled_url or expected_upscaled_url
                     else:
                         # Determine the path/URL to the original art for the upscaler
-                        original_art_path_for_upscaler = f"{self.image_server_path_prefix}/original/{hosted_original_art_url.split('/')[-1]}" if self.output_dir else hosted_original_art_url
+                        original_art_filename = basename(hosted_original_art_url)
+                        original_art_path_for_upscaler = f"{self.image_server_path_prefix}/original/{original_art_filename}" if self.output_dir else hosted_original_art_url
                         
-                        upscaled_bytes = self._upscale_image_with_ilaria(original_art_path_for_upscaler, hosted_original_art_url.split('/')[-1], original_image_mime_type)
-                        if upscaled_bytes:
-                            _, upscaled_ext = self._get_image_mime_type_and_extension(upscaled_bytes)
-                            upscaled_filename = f"{sanitized_card_name}_{set_code_sanitized}_{collector_number_sanitized}{upscaled_ext or '.png'}"
-                            self._output_image(upscaled_bytes, upscaled_dir, upscaled_filename)
-                            hosted_upscaled_art_url = f"{self.image_server_base_url.rstrip('/')}{self.image_server_path_prefix}/{upscaled_dir}/{upscaled_filename}"
+                        # The card is emitted with the original art; finish_pending_upscales() swaps in the upscaled art.
+                        if self._upscale_executor is None:
+                            self._upscale_executor = ThreadPoolExecutor(max_workers=_UPSCALE_WORKERS, thread_name_prefix="upscale")
+                        pending_upscale = self._upscale_executor.submit(
+                            self._upscale_and_host, original_art_path_for_upscaler, original_art_filename,
+                            original_image_mime_type, upscaled_dir, asset_key
+                        )
     
                 # 4. Set final art source URL
                 if hosted_upscaled_art_url:
@@ -904,11 +1375,20 @@ class CardBuilder:
                         logger.info(f"Adjusted artZoom for upscaled image to: {art_zoom:.4f}")
                 elif hosted_original_art_url:
                     final_art_source_url = hosted_original_art_url
+            elif self.auto_fit_art and art_crop_url:
+                # Nothing to save: auto-fit only needs the art's dimensions, so just its header is downloaded.
+                # A failed fetch keeps the frame's default placement rather than dropping the card.
+                try: auto_fit_params = self._calculate_auto_fit_art_params(art_crop_url)
+                except (ScryfallAPIException, ImageProcessingException) as e:
+                    logger.warning(f"Auto-Fit failed for {scryfall_card_name}, using default art placement: {e}"); auto_fit_params = None
+                if auto_fit_params:
+                    art_x, art_y, art_zoom = auto_fit_params["artX"], auto_fit_params["artY"], auto_fit_params["artZoom"]
+                    logger.info(f"Auto-Fit applied for {scryfall_card_name}: X={art_x:.4f}, Y={art_y:.4f}, Zoom={art_zoom:.4f}")
     
             # --- Set Symbol and P/T ---
-            set_symbol_x = self.frame_config.get("set_symbol_x", 0.0); set_symbol_y = self.frame_config.get("set_symbol_y", 0.0); set_symbol_zoom = self.frame_config.get("set_symbol_zoom", 0.1)
+            set_symbol_x, set_symbol_y, set_symbol_zoom = self._set_symbol_defaults
             actual_set_code_for_url = self.set_symbol_override.lower() if self.set_symbol_override else set_code_from_scryfall.lower()
-            set_symbol_source_url = f"{ccProto}://{ccHost}:{ccPort}/img/setSymbols/official/{actual_set_code_for_url}-{rarity_code_for_symbol}.svg"
+            set_symbol_source_url = self._set_symbol_url_fmt.format(code=actual_set_code_for_url, rarity=rarity_code_for_symbol)
             if self.auto_fit_set_symbol and set_symbol_source_url:
                 auto_fit_symbol_params_result = self._calculate_auto_fit_set_symbol_params(set_symbol_source_url)
                 if auto_fit_symbol_params_result and auto_fit_symbol_params_result.get("_status", "").startswith("success"):
@@ -923,54 +1403,36 @@ class CardBuilder:
             
             display_title_text = basic_land_type_override if is_basic_land_fetch_mode and basic_land_type_override else scryfall_card_name
             
-            rules_text_config = self.frame_config.get("text", {}).get("rules", {}).copy()
-            type_text_config = self.frame_config.get("text", {}).get("type", {})
-
-            FLAVOR_TEXT_Y_OFFSET = 0.025 # Adjust this value as needed
-            if flavor_text_from_scryfall and "y" in rules_text_config:
-                rules_text_config["y"] += FLAVOR_TEXT_Y_OFFSET
+            rules_text_config = self._rules_text_cfgs[1 if flavor_text_from_scryfall else 0]
+            type_text_config = self._text_cfg.get("type", {})
     
             rules_font_size = calculate_font_size(final_rules_text, rules_text_config.get("width", 0.8), rules_text_config.get("height", 0.28), rules_text_config.get("size", 0.036))
             type_font_size = calculate_font_size(card_data.get('type_line', ''), type_text_config.get("width", 0.8), type_text_config.get("height", 0.05), type_text_config.get("size", 0.032))
     
-            card_obj_data = {
-                "width": self.frame_config["width"], "height": self.frame_config["height"],
-                "marginX": self.frame_config.get("margin_x", 0), "marginY": self.frame_config.get("margin_y", 0),
+            card_obj_data = dict(self._card_template)
+            card_obj_data.update({
                 "frames": frames_for_card_obj, 
                 "artSource": final_art_source_url, 
                 "artX": art_x, "artY": art_y, "artZoom": art_zoom, 
                 "artRotate": art_rotate,
                 "artSourceOriginalScryfall": art_crop_url, 
-                **({"artSourceHostedOriginal": hosted_original_art_url} if hosted_original_art_url else {}),
-                **({"artSourceHostedUpscaled": hosted_upscaled_art_url} if hosted_upscaled_art_url and hosted_upscaled_art_url != final_art_source_url else {}),
                 "setSymbolSource": set_symbol_source_url, "setSymbolX":set_symbol_x, "setSymbolY": set_symbol_y, "setSymbolZoom": set_symbol_zoom,
-                "watermarkSource": f"{ccProto}://{ccHost}:{ccPort}/{self.frame_config['watermark_source']}",
-                "watermarkX": self.frame_config["watermark_x"], "watermarkY": self.frame_config["watermark_y"], "watermarkZoom": self.frame_config["watermark_zoom"], 
-                "watermarkLeft": self.frame_config["watermark_left"], "watermarkRight": self.frame_config["watermark_right"], "watermarkOpacity": self.frame_config["watermark_opacity"],
-                "version": self.frame_config.get("version_string", self.frame_type), 
                 "showsFlavorBar": shows_flavor_bar_for_this_card, 
                 "manaSymbols": mana_symbols,
-                "infoYear": DEFAULT_INFO_YEAR, "margins": self.frame_config.get("margins", False),
-                "bottomInfoTranslate": self.frame_config.get("bottomInfoTranslate", {"x": 0, "y": 0}), "bottomInfoRotate": self.frame_config.get("bottomInfoRotate", 0),
-                "bottomInfoZoom": self.frame_config.get("bottomInfoZoom", 1), "bottomInfoColor": self.frame_config.get("bottomInfoColor", "white"),
-                "onload": self.frame_config.get("onload", None), "hideBottomInfoBorder": self.frame_config.get("hideBottomInfoBorder", False),
-                "bottomInfo": self.frame_config.get("bottom_info", {}), "artBounds": self.frame_config.get("art_bounds", {}),
-                "setSymbolBounds": self.frame_config.get("set_symbol_bounds", {}), "watermarkBounds": self.frame_config.get("watermark_bounds", {}),
                 "text": {
-                    "mana": {**self.frame_config.get("text", {}).get("mana", {}), "text": card_data.get('mana_cost', '')},
-                    "title": {**self.frame_config.get("text", {}).get("title", {}), "text": display_title_text},
-                    "type": {**self.frame_config.get("text", {}).get("type", {}), "text": card_data.get('type_line', 'Instant'), "size": type_font_size},
+                    "mana": {**self._text_cfg.get("mana", {}), "text": card_data.get('mana_cost', '')},
+                    "title": {**self._text_cfg.get("title", {}), "text": display_title_text},
+                    "type": {**type_text_config, "text": card_data.get('type_line', 'Instant'), "size": type_font_size},
                     "rules": { **rules_text_config, "text": final_rules_text, "size": rules_font_size },
-                    "pt": {**self.frame_config.get("text", {}).get("pt", {}), "text": pt_text_final }
+                    "pt": {**self._text_cfg.get("pt", {}), "text": pt_text_final }
                 },
                 "infoNumber": collector_number_from_scryfall, 
                 "infoRarity": rarity_code_for_symbol.upper() if rarity_code_for_symbol else DEFAULT_INFO_RARITY, 
                 "infoSet": set_code_from_scryfall.upper(), 
-                "infoLanguage": DEFAULT_INFO_LANGUAGE, 
                 "infoArtist": artist_name, 
-                "infoNote": DEFAULT_INFO_NOTE,
-                "noCorners": self.frame_config.get("noCorners", True)
-            }
-            if self.frame_type == "8th": card_obj_data.update({"serialNumber": "", "serialTotal": "", "serialX": "", "serialY": "", "serialScale": ""})
+            })
+            if hosted_original_art_url: card_obj_data["artSourceHostedOriginal"] = hosted_original_art_url
+            if hosted_upscaled_art_url and hosted_upscaled_art_url != final_art_source_url: card_obj_data["artSourceHostedUpscaled"] = hosted_upscaled_art_url
+            if pending_upscale: self._pending_upscales.append((card_name, card_obj_data, pending_upscale))
             
             return {"key": card_name, "data": card_obj_data}
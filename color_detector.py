@@ -3,13 +3,36 @@
 Module for detecting card colors from Scryfall data
 """
 import logging
-from typing import Dict, List, Union
-import re # Import re for more complex parsing if needed, though not used in this version yet
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
+import re
 
-from color_mapping import COLOR_CODE_MAP
+from color_mapping import COLOR_CODE_MAP, WHITE_INFO, BLUE_INFO, BLACK_INFO, RED_INFO, GREEN_INFO, COLORLESS_INFO, LAND_INFO
 
 logger = logging.getLogger(__name__)
 
+_ADD_CLAUSE_RE = re.compile(r'Add\s[^.;]+', re.IGNORECASE)
+_MANA_RE = re.compile(r'\{([WUBRG])\}')
+# One scan of the type line yields every word get_color_info branches on.
+_TYPE_RE = re.compile(r'\b(Vehicle|Artifact|Land)\b')
+# Basic land types match case-insensitively, as before; WUBRG order breaks ties on dual-typed lands.
+_BASIC_LAND_RE = re.compile(r'(plains|island|swamp|mountain|forest)', re.IGNORECASE)
+_BASIC_LAND_COLOR_KEYS = (('plains', WHITE_INFO), ('island', BLUE_INFO), ('swamp', BLACK_INFO), ('mountain', RED_INFO), ('forest', GREEN_INFO))
+# Colourless and land fallbacks are the shared read-only entries from color_mapping.
+_COLORLESS = COLORLESS_INFO
+_BASE_LAND = LAND_INFO
+# The five basics are the most common lands by far; their answer never depends on oracle text.
+_BASIC_LAND_RESULTS = {name: (_BASE_LAND, info) for name, info in (('Plains', WHITE_INFO), ('Island', BLUE_INFO), ('Swamp', BLACK_INFO), ('Mountain', RED_INFO), ('Forest', GREEN_INFO))}
+# The finite set of non-land outcomes is built once and shared; only gold results carry a per-card component list.
+_MONO_KEYS = ('W', 'U', 'B', 'R', 'G')
+_VEHICLE_COLORLESS = {**(COLOR_CODE_MAP.get('V') or COLOR_CODE_MAP.get('A')), 'is_vehicle': True, 'is_artifact': True}
+_MONO_VEHICLES = {k: {**COLOR_CODE_MAP[k], 'name': f"{COLOR_CODE_MAP[k]['name']} Vehicle", 'is_artifact': True, 'is_vehicle': True} for k in _MONO_KEYS}
+_GOLD_VEHICLE_BASE = {**(COLOR_CODE_MAP.get('V') or COLOR_CODE_MAP.get('M') or COLOR_CODE_MAP.get('A')), 'name': "Multicolored Vehicle", 'is_gold': True, 'is_artifact': True, 'is_vehicle': True}
+_ARTIFACT_COLORLESS = {**(COLOR_CODE_MAP.get('A') or COLOR_CODE_MAP.get('C')), 'is_artifact': True}
+_MONO_ARTIFACTS = {k: {**COLOR_CODE_MAP[k], 'name': f"{COLOR_CODE_MAP[k]['name']} Artifact", 'is_artifact': True} for k in _MONO_KEYS}
+_GOLD_ARTIFACT_BASE = {**COLOR_CODE_MAP.get('MA', COLOR_CODE_MAP.get('M', COLOR_CODE_MAP.get('A'))), 'name': "Multicolored Artifact", 'is_gold': True, 'is_artifact': True}
+_GOLD_BASE = {**COLOR_CODE_MAP.get('M', {'code': 'm', 'name': 'Multicolored'}), 'is_gold': True}
+
 class ColorDetector:
     """Class for detecting card colors from Scryfall data"""
     
@@ -21,133 +44,144 @@ class ColorDetector:
         If no specific WUBRG colors found, returns [BaseLandInfo].
         Returns empty list if not a land or no oracle text.
         """
-        card_name = card_data.get('name', 'Unknown Card')
-        if 'type_line' not in card_data or 'Land' not in card_data['type_line']:
-            return [] # Not a land
-            
-        if 'oracle_text' not in card_data or not card_data['oracle_text']:
-            return [COLOR_CODE_MAP.get('L', {'code': 'l', 'name': 'Land'})] 
+        colors = ColorDetector._producing_land_colors(card_data.get('type_line', ''), card_data.get('oracle_text') or '')
+        if len(colors) == 2 and colors[1] is COLOR_CODE_MAP.get('M'):
+            logger.debug("'%s' detected as a gold land based on oracle text.", card_data.get('name', 'Unknown Card'))
+        return list(colors)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _producing_land_colors(type_line: str, oracle_text: str) -> Tuple[Dict, ...]:
+        """Cached core of detect_producing_land_colors, keyed on the only fields it reads."""
+        if 'Land' not in type_line:
+            return () # Not a land
             
-        oracle_text = card_data['oracle_text']
+        if not oracle_text:
+            return (_BASE_LAND,)
         
         # Check for "mana of any color" which indicates a multicolored land
         for line in oracle_text.split('\n'):
             stripped_line = line.strip()
             if stripped_line.startswith('{T}') and "mana of any" in stripped_line.lower() and "color" in stripped_line.lower():
-                logger.debug(f"'{card_name}' detected as a gold land based on oracle text.")
-                return [COLOR_CODE_MAP.get('L'), COLOR_CODE_MAP.get('M')]
+                return (COLOR_CODE_MAP.get('L'), COLOR_CODE_MAP.get('M'))
         
-        mana_positions = []
-        # Iterate through WUBRG for mana symbols
-        for color_key_scryfall in ['W', 'U', 'B', 'R', 'G']: # Scryfall keys W, U, B, R, G
-            internal_color_info = COLOR_CODE_MAP.get(color_key_scryfall) 
-            if not internal_color_info: continue
-
-            mana_symbol_scryfall = f"{{{color_key_scryfall}}}" # e.g. {W}, {U}
-            
-            add_clauses = re.findall(r'Add\s[^.;]+', oracle_text, re.IGNORECASE)
-            
-            # Check if the mana symbol appears in any "Add" clause
-            found_in_add_clause = False
-            for clause in add_clauses:
-                if mana_symbol_scryfall in clause:
-                    found_in_add_clause = True
-                    break
-            
-            if found_in_add_clause:
-                if not any(item['color_key'] == color_key_scryfall for item in mana_positions):
-                    first_occurrence_index = oracle_text.find(mana_symbol_scryfall)
-                    mana_positions.append({
-                        "position": first_occurrence_index if first_occurrence_index != -1 else float('inf'),
-                        "color_key": color_key_scryfall, 
-                        "color_info": internal_color_info 
-                    })
-
-        # Sort by the order they appear in text (if multiple distinct colors are found)
-        mana_positions.sort(key=lambda x: x["position"])
+        # Colors named in any "Add" clause, then ordered by where each first appears anywhere in the text
+        add_clause_colors = set(_MANA_RE.findall(" ".join(_ADD_CLAUSE_RE.findall(oracle_text))))
+        first_seen: Dict[str, int] = {}
+        for m in (_MANA_RE.finditer(oracle_text) if add_clause_colors else ()):
+            first_seen.setdefault(m.group(1), m.start())
+        mana_positions = [COLOR_CODE_MAP[k] for k in first_seen if k in add_clause_colors and COLOR_CODE_MAP.get(k)]
         
-        base_land = COLOR_CODE_MAP.get('L', {'code': 'l', 'name': 'Land'})
+        base_land = _BASE_LAND
         if mana_positions: # If any WUBRG producing abilities were found
-            return [base_land] + [item["color_info"] for item in mana_positions]
+            return (base_land, *mana_positions)
         else:
             # If no WUBRG symbols found in "Add" abilities (e.g. Strip Mine "Add {C}")
-            return [base_land]
+            return (base_land,)
 
     @staticmethod
     def get_color_info(card_data: Dict) -> Union[Dict, List[Dict]]:
         """Extract color information from card data."""
-        card_name = card_data.get('name', 'Unknown Card')
-        type_line = card_data.get('type_line', '')
+        # Reprints and basic-land fetches repeat the same inputs; results are cached on just those fields.
+        type_line = card_data.get('type_line') or ''
+        basic_land = _BASIC_LAND_RESULTS.get(card_data.get('name'))
+        if basic_land and type_line.startswith('Basic Land'): return list(basic_land)
+        colors = tuple(card_data.get('colors') or ())
+        oracle_text = (card_data.get('oracle_text') or '') if 'Land' in type_line else ''
+        info = ColorDetector._get_color_info_cached(type_line, colors, oracle_text)
+        return list(info) if isinstance(info, tuple) else info
 
-        if 'Vehicle' in type_line:
-            # logger.debug(f"Card '{card_name}' is a Vehicle.") # Debugging removed
-            scryfall_colors = card_data.get('colors', [])
-            if scryfall_colors: 
-                if len(scryfall_colors) >= 2: 
-                    component_colors = [COLOR_CODE_MAP[c] for c in scryfall_colors if c in COLOR_CODE_MAP]
-                    return {**(COLOR_CODE_MAP.get('V') or COLOR_CODE_MAP.get('M') or COLOR_CODE_MAP.get('A')), 'name': "Multicolored Vehicle", 'is_gold': True, 'is_artifact': True, 'is_vehicle': True, 'component_colors': component_colors }
-                elif len(scryfall_colors) == 1: 
-                     color_key = scryfall_colors[0]
-                     return {**(COLOR_CODE_MAP.get(color_key) or COLOR_CODE_MAP.get('V')), 'name': f"{COLOR_CODE_MAP.get(color_key,{}).get('name','Unknown Color')} Vehicle", 'is_artifact': True, 'is_vehicle': True }
-            return {**(COLOR_CODE_MAP.get('V') or COLOR_CODE_MAP.get('A')), 'is_vehicle': True, 'is_artifact': True}
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_color_info_cached(type_line: str, scryfall_colors: Tuple[str, ...], oracle_text: str) -> Union[Dict, Tuple[Dict, ...]]:
+        """Returns shared, cached results (land lists as tuples); callers must not mutate them."""
 
-        if 'Artifact' in type_line: 
-            # logger.debug(f"Card '{card_name}' is an Artifact (non-vehicle).") # Debugging removed
-            scryfall_colors = card_data.get('colors', [])
-            if scryfall_colors: 
-                if len(scryfall_colors) >= 2: 
-                    component_colors = [COLOR_CODE_MAP[c] for c in scryfall_colors if c in COLOR_CODE_MAP]
-                    base_code = COLOR_CODE_MAP.get('MA', COLOR_CODE_MAP.get('M', COLOR_CODE_MAP.get('A')))
-                    return {**base_code, 'name': "Multicolored Artifact", 'is_gold': True, 'is_artifact': True, 'component_colors': component_colors}
-                elif len(scryfall_colors) == 1: 
-                    color_key = scryfall_colors[0]
-                    return {**COLOR_CODE_MAP[color_key], 'name': f"{COLOR_CODE_MAP.get(color_key,{}).get('name','Unknown Color')} Artifact", 'is_artifact': True }
-            return {**(COLOR_CODE_MAP.get('A') or COLOR_CODE_MAP.get('C')), 'is_artifact': True}
+        type_tokens = set(_TYPE_RE.findall(type_line))
+        if not type_tokens and len(scryfall_colors) == 1:
+            # Mono-coloured spells and creatures are the common case: skip the vehicle/artifact/land branches.
+            return COLOR_CODE_MAP.get(scryfall_colors[0], _COLORLESS)
+        # Vehicle outranks Artifact outranks Land, whatever order the words appear in.
+        for type_word, handler in _TYPE_HANDLERS:
+            if type_word in type_tokens: return handler(type_line, scryfall_colors, oracle_text)
+        return _spell_color_info(type_line, scryfall_colors, oracle_text)
 
-        if 'Land' in type_line:
-            # logger.debug(f"Card '{card_name}' is a Land.") # Debugging removed
-            producing_land_colors = ColorDetector.detect_producing_land_colors(card_data) # Use new method
-            
-            if len(producing_land_colors) > 1: # It produces specific WUBRG colors
-                # logger.debug(f"Detected producing land colors for '{card_name}': {[c['name'] for c in producing_land_colors[1:]]}") # Debug
-                return producing_land_colors
-            
-            type_line_lower = type_line.lower()
-            basic_land_map = {'plains': 'W', 'island': 'U', 'swamp': 'B', 'mountain': 'R', 'forest': 'G'}
-            for land_name_part, color_key in basic_land_map.items():
-                if land_name_part in type_line_lower:
-                    # logger.debug(f"Detected basic land '{card_name}' as {COLOR_CODE_MAP[color_key]['name']}.") # Debug
-                    return [COLOR_CODE_MAP.get('L', {'code':'l', 'name':'Land'}), COLOR_CODE_MAP[color_key]]
-            
-            # If not a WUBRG-producing land from oracle text, and not a named basic land,
-            # it's a generic land (like Wastes, or Strip Mine if its {C} wasn't parsed as a WUBRG color).
-            # detect_producing_land_colors should have returned [BaseLandInfo] for these.
-            # logger.debug(f"'{card_name}' is a generic land (returned from detect_producing_land_colors or as fallback).") # Debug
-            return producing_land_colors if producing_land_colors else [COLOR_CODE_MAP.get('L', {'code':'l', 'name':'Land'})]
-                
-        scryfall_colors = card_data.get('colors')
-        if scryfall_colors is None or not scryfall_colors: 
-            # logger.debug(f"Card '{card_name}' is Colorless (non-artifact, non-land, non-vehicle).") # Debug
-            return COLOR_CODE_MAP.get('C', {'code': 'c', 'name': 'Colorless'})
-        
-        num_colors = len(scryfall_colors)
-        if num_colors == 1: 
+def _vehicle_color_info(type_line: str, scryfall_colors: Tuple[str, ...], oracle_text: str) -> Union[Dict, Tuple[Dict, ...]]:
+    """Vehicles: coloured, gold or colourless vehicle frames."""
+    # logger.debug(f"Card '{card_name}' is a Vehicle.") # Debugging removed
+    if scryfall_colors: 
+        if len(scryfall_colors) >= 2: 
+            component_colors = list(filter(None, map(COLOR_CODE_MAP.get, scryfall_colors)))
+            gold_info = _GOLD_VEHICLE_BASE.copy()
+            gold_info['component_colors'] = component_colors
+            return gold_info
+        elif len(scryfall_colors) == 1: 
+             color_key = scryfall_colors[0]
+             return _MONO_VEHICLES.get(color_key) or {**(COLOR_CODE_MAP.get(color_key) or COLOR_CODE_MAP.get('V')), 'name': f"{COLOR_CODE_MAP.get(color_key,{}).get('name','Unknown Color')} Vehicle", 'is_artifact': True, 'is_vehicle': True }
+    return _VEHICLE_COLORLESS
+
+def _artifact_color_info(type_line: str, scryfall_colors: Tuple[str, ...], oracle_text: str) -> Union[Dict, Tuple[Dict, ...]]:
+    """Non-vehicle artifacts."""
+    # logger.debug(f"Card '{card_name}' is an Artifact (non-vehicle).") # Debugging removed
+    if scryfall_colors: 
+        if len(scryfall_colors) >= 2: 
+            component_colors = list(filter(None, map(COLOR_CODE_MAP.get, scryfall_colors)))
+            gold_info = _GOLD_ARTIFACT_BASE.copy()
+            gold_info['component_colors'] = component_colors
+            return gold_info
+        elif len(scryfall_colors) == 1: 
             color_key = scryfall_colors[0]
-            if color_key in COLOR_CODE_MAP: 
-                # logger.debug(f"Card '{card_name}' is Monocolored: {COLOR_CODE_MAP[color_key]['name']}.") # Debug
-                return COLOR_CODE_MAP[color_key]
-            else: 
-                # logger.warning(f"Unknown monocolor key '{color_key}' for card '{card_name}'. Defaulting to Colorless.") # Debug
-                return COLOR_CODE_MAP.get('C', {'code': 'c', 'name': 'Colorless'})
-        elif num_colors >= 2: 
-            # logger.debug(f"Card '{card_name}' is Multicolor/Gold. Colors: {scryfall_colors}.") # Debug
-            component_color_dicts = [COLOR_CODE_MAP[c] for c in scryfall_colors if c in COLOR_CODE_MAP]
-            if component_color_dicts:
-                base_multicolor_info = COLOR_CODE_MAP.get('M', {'code': 'm', 'name': 'Multicolored'})
-                return {**base_multicolor_info, 'is_gold': True, 'component_colors': component_color_dicts}
-            else: 
-                # logger.warning(f"Could not map component colors for gold card '{card_name}'. Colors: {scryfall_colors}. Defaulting.") # Debug
-                return COLOR_CODE_MAP.get('M', COLOR_CODE_MAP.get('C', {'code': 'c', 'name': 'Colorless'})) 
-        
-        # logger.warning(f"No color explicitly found for '{card_name}'. Defaulting to Colorless.") # Debug
-        return COLOR_CODE_MAP.get('C', {'code': 'c', 'name': 'Colorless'})
+            return _MONO_ARTIFACTS.get(color_key) or {**COLOR_CODE_MAP[color_key], 'name': f"{COLOR_CODE_MAP.get(color_key,{}).get('name','Unknown Color')} Artifact", 'is_artifact': True }
+    return _ARTIFACT_COLORLESS
+
+def _land_color_info(type_line: str, scryfall_colors: Tuple[str, ...], oracle_text: str) -> Union[Dict, Tuple[Dict, ...]]:
+    """Lands: [BaseLandInfo, Color1Info, ...] from the mana they produce or their basic land types."""
+    # logger.debug(f"Card '{card_name}' is a Land.") # Debugging removed
+    producing_land_colors = ColorDetector._producing_land_colors(type_line, oracle_text)
+    
+    if len(producing_land_colors) > 1: # It produces specific WUBRG colors
+        # logger.debug(f"Detected producing land colors for '{card_name}': {[c['name'] for c in producing_land_colors[1:]]}") # Debug
+        return producing_land_colors
+    
+    basic_types = {name.lower() for name in _BASIC_LAND_RE.findall(type_line)}
+    for land_name_part, land_color_info in _BASIC_LAND_COLOR_KEYS:
+        if land_name_part in basic_types:
+            # logger.debug(f"Detected basic land '{card_name}' as {COLOR_CODE_MAP[color_key]['name']}.") # Debug
+            return (_BASE_LAND, land_color_info)
+    
+    # If not a WUBRG-producing land from oracle text, and not a named basic land,
+    # it's a generic land (like Wastes, or Strip Mine if its {C} wasn't parsed as a WUBRG color).
+    # detect_producing_land_colors should have returned [BaseLandInfo] for these.
+    # logger.debug(f"'{card_name}' is a generic land (returned from detect_producing_land_colors or as fallback).") # Debug
+    return producing_land_colors if producing_land_colors else (_BASE_LAND,)
+
+def _spell_color_info(type_line: str, scryfall_colors: Tuple[str, ...], oracle_text: str) -> Dict:
+    """Everything else, by Scryfall colours."""
+    if not scryfall_colors: 
+        # logger.debug(f"Card '{card_name}' is Colorless (non-artifact, non-land, non-vehicle).") # Debug
+        return _COLORLESS
+    
+    num_colors = len(scryfall_colors)
+    if num_colors == 1: 
+        color_key = scryfall_colors[0]
+        if color_key in COLOR_CODE_MAP: 
+            # logger.debug(f"Card '{card_name}' is Monocolored: {COLOR_CODE_MAP[color_key]['name']}.") # Debug
+            return COLOR_CODE_MAP[color_key]
+        else: 
+            # logger.warning(f"Unknown monocolor key '{color_key}' for card '{card_name}'. Defaulting to Colorless.") # Debug
+            return _COLORLESS
+    elif num_colors >= 2: 
+        # logger.debug(f"Card '{card_name}' is Multicolor/Gold. Colors: {scryfall_colors}.") # Debug
+        component_color_dicts = list(filter(None, map(COLOR_CODE_MAP.get, scryfall_colors)))
+        if component_color_dicts:
+            gold_info = _GOLD_BASE.copy()
+            gold_info['component_colors'] = component_color_dicts
+            return gold_info
+        else: 
+            # logger.warning(f"Could not map component colors for gold card '{card_name}'. Colors: {scryfall_colors}. Defaulting.") # Debug
+            return COLOR_CODE_MAP.get('M', _COLORLESS) 
+    
+    # logger.warning(f"No color explicitly found for '{card_name}'. Defaulting to Colorless.") # Debug
+    return _COLORLESS
+
+
+_TYPE_HANDLERS = (('Vehicle', _vehicle_color_info), ('Artifact', _artifact_color_info), ('Land', _land_color_info))
@@ -2,8 +2,10 @@
 Color and rarity mapping for MTG cards
 """
 
-# Color mapping
-COLOR_CODE_MAP = {
+from types import MappingProxyType
+
+# Color mapping; entries are read-only and shared, so callers that need a variant must copy.
+_RAW_COLOR_CODE_MAP = {
     'W': {'code': 'w', 'name': 'White'},
     'U': {'code': 'u', 'name': 'Blue'},
     'B': {'code': 'b', 'name': 'Black'},
@@ -16,6 +18,10 @@ COLOR_CODE_MAP = {
     'M': {'code': 'm', 'name': 'Multicolored'}, # For M15 Gold/Multicolor frames
     'V': {'code': 'v', 'name': 'Vehicle'}       # For Vehicle P/T boxes on m15ub
 }
+COLOR_CODE_MAP = MappingProxyType({k: MappingProxyType(v) for k, v in _RAW_COLOR_CODE_MAP.items()})
+
+WHITE_INFO, BLUE_INFO, BLACK_INFO, RED_INFO, GREEN_INFO = (COLOR_CODE_MAP[k] for k in "WUBRG")
+COLORLESS_INFO, LAND_INFO, ARTIFACT_INFO, MULTICOLORED_INFO, VEHICLE_INFO = (COLOR_CODE_MAP[k] for k in "CLAMV")
 
 # Rarity mapping
 RARITY_MAP = {
@@ -2,6 +2,7 @@
 Configuration module for the MTG Scryfall to CardConjurer Converter
 """
 import logging
+from types import MappingProxyType
 
 # Server configuration
 ccProto = "http"
@@ -26,3 +27,9 @@ def init_logging():
         level=logging.DEBUG,
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
+
+def freeze_config(obj):
+    """Recursively wraps dicts in read-only MappingProxyType and turns lists into tuples"""
+    if isinstance(obj, dict): return MappingProxyType({k: freeze_config(v) for k, v in obj.items()})
+    if isinstance(obj, list): return tuple(freeze_config(v) for v in obj)
+    return obj
@@ -2,6 +2,11 @@
 Configuration for 8th Edition frames
 """
 
+# Frames on which the bottom-line text is drawn white instead of black.
+_WHITE_TEXT_FRAMES = "{conditionalcolor:Black_Frame,Land_Frame,Colorless_Frame:white}"
+# The artist, copyright and footer lines share one single-line box style.
+_BOTTOM_INFO_STYLE = {"x": 0.094, "width": 0.8107, "oneLine": True, "color": "black", "shadowX": 0.0007, "shadowY": 0.0005}
+
 EIGHTH_FRAME = {
     "width": 2010,
     "height": 2814,
@@ -103,44 +108,29 @@ EIGHTH_FRAME = {
     },
     "bottom_info": {
         "top": {
-            "text": "{conditionalcolor:Black_Frame,Land_Frame,Colorless_Frame:white}￮ {elemidinfo-artist}",
-            "x": 0.094,
+            **_BOTTOM_INFO_STYLE,
+            "text": _WHITE_TEXT_FRAMES + "￮ {elemidinfo-artist}",
             "y": 0.9228571428571428,
-            "width": 0.8107,
             "height": 0.0248,
-            "oneLine": True,
             "font": "matrixb",
-            "size": 0.0248,
-            "color": "black",
-            "shadowX": 0.0007,
-            "shadowY": 0.0005
+            "size": 0.0248
         },
         "wizards": {
+            **_BOTTOM_INFO_STYLE,
             "name": "wizards",
-            "text": "{conditionalcolor:Black_Frame,Land_Frame,Colorless_Frame:white}™ & © 1993-{elemidinfo-year} Wizards of the Coast, Inc. {elemidinfo-number}",
-            "x": 0.094,
+            "text": _WHITE_TEXT_FRAMES + "™ & © 1993-{elemidinfo-year} Wizards of the Coast, Inc. {elemidinfo-number}",
             "y": 0.9323809523809524,
-            "width": 0.8107,
             "height": 0.0153,
-            "oneLine": True,
             "font": "mplantin",
-            "size": 0.0153,
-            "color": "black",
-            "shadowX": 0.0007,
-            "shadowY": 0.0005
+            "size": 0.0153
         },
         "bottom": {
-            "text": "{conditionalcolor:Black_Frame,Land_Frame,Colorless_Frame:white}NOT FOR SALE   CardConjurer.com",
-            "x": 0.094,
+            **_BOTTOM_INFO_STYLE,
+            "text": _WHITE_TEXT_FRAMES + "NOT FOR SALE   CardConjurer.com",
             "y": 0.9495238095238095,
-            "width": 0.8107,
             "height": 0.0134,
-            "oneLine": True,
             "font": "mplantin",
-            "size": 0.0134,
-            "color": "black",
-            "shadowX": 0.0007,
-            "shadowY": 0.0005
+            "size": 0.0134
         }
     },
     "uses_frame_set": False  # Indicates whether the frame uses a frameSet in paths
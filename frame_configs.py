@@ -2,46 +2,45 @@
 Frame configurations module
 Imports and provides access to different frame configurations
 """
-import logging 
+import importlib
+import logging
+from functools import lru_cache
 
-from seventh_frame import SEVENTH_FRAME
-from eighth_frame import EIGHTH_FRAME
-from m15_frame import M15_FRAME
-from m15regularnew_frame import M15_REGULAR_NEW_FRAME
-from modern_frame import MODERN_FRAME
 from exceptions import FrameGenerationException
-try:
-    from m15ub_frame import M15UB_FRAME 
-    logger_fc = logging.getLogger(__name__) 
-    logger_fc.info("Successfully imported M15UB_FRAME from m15ub_frame.py")
-except ImportError as e:
-    logger_fc = logging.getLogger(__name__)
-    logger_fc.error(f"FAILED to import M15UB_FRAME from m15ub_frame.py: {e}")
-    M15UB_FRAME = None 
+from config import freeze_config
+logger_fc = logging.getLogger(__name__)
 
+# A run uses one frame type, so each frame module is imported only when first requested.
+_FRAME_MODULES = {
+    "seventh": ("seventh_frame", "SEVENTH_FRAME"),
+    "8th": ("eighth_frame", "EIGHTH_FRAME"),
+    "m15": ("m15_frame", "M15_FRAME"),
+    "m15ub": ("m15ub_frame", "M15UB_FRAME"),
+    "m15regularnew": ("m15regularnew_frame", "M15_REGULAR_NEW_FRAME"),
+    "modern": ("modern_frame", "MODERN_FRAME"),
+}
+
+# Frame configs are shared by every card; freezing them makes that sharing safe without defensive copies.
+@lru_cache(maxsize=None)
+def _load_frame(frame_type: str):
+    """Import and freeze the config for a known frame type."""
+    module_name, attr = _FRAME_MODULES[frame_type]
+    return freeze_config(getattr(importlib.import_module(module_name), attr))
+
+# The result depends only on the frame type string, and argparse limits that to a handful of choices.
+@lru_cache(maxsize=None)
 def get_frame_config(frame_type: str):
     """Get the configuration for the specified frame type."""
-    logger_fc = logging.getLogger(__name__) 
-    logger_fc.debug(f"get_frame_config called with frame_type: '{frame_type}'")
-
-    if frame_type == "8th":
-        logger_fc.debug("Returning EIGHTH_FRAME")
-        return EIGHTH_FRAME
-    elif frame_type == "m15":
-        logger_fc.debug("Returning M15_FRAME")
-        return M15_FRAME
-    elif frame_type == "m15regularnew":
-        logger_fc.debug("Returning M15_REGULAR_NEW_FRAME")
-        return M15_REGULAR_NEW_FRAME
-    elif frame_type == "modern":
-        logger_fc.debug("Returning MODERN_FRAME")
-        return MODERN_FRAME
-    elif frame_type == "m15ub": 
-        if M15UB_FRAME is not None:
-            logger_fc.debug("Returning M15UB_FRAME")
-            return M15UB_FRAME
-        else:
+    logger_fc.debug("get_frame_config: resolving frame config for '%s'", frame_type)
+    if frame_type not in _FRAME_MODULES:
+        logger_fc.debug("frame_type '%s' not matched or unknown, defaulting to SEVENTH_FRAME", frame_type)
+        frame_type = "seventh"
+    if frame_type == "m15ub":
+        try:
+            frame = _load_frame(frame_type)
+        except ImportError as e:
+            logger_fc.error(f"FAILED to import M15UB_FRAME from m15ub_frame.py: {e}")
             raise FrameGenerationException("M15UB_FRAME was not imported correctly or is None.", "Please check the m15ub_frame.py file.")
-    else: 
-        logger_fc.debug(f"frame_type '{frame_type}' not matched or unknown, defaulting to SEVENTH_FRAME")
-        return SEVENTH_FRAME
\ No newline at end of file
+        logger_fc.info("Successfully imported M15UB_FRAME from m15ub_frame.py")
+        return frame
+    return _load_frame(frame_type)
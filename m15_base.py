@@ -0,0 +1,50 @@
+# --- file: m15_base.py ---
+"""
+Fields shared by the M15 regular (m15_frame.py) and M15 unbordered (m15ub_frame.py) configurations.
+"""
+
+M15_BASE = {
+    "width": 2010,
+    "height": 2814,
+    "margin_x": 0,
+    "margin_y": 0,
+
+    "art_zoom": 3.027,
+    "art_rotate": "0",
+
+    "watermark_source": "img/blank.png",
+    "watermark_zoom": 649,
+    "watermark_left": "#b79d58",
+    "watermark_right": "none",
+    "watermark_opacity": 0.4,
+
+    # --- Shared Path Formats ---
+    "legend_crown_cover_src": "/img/black.png",
+    "mask_path_format": "/img/frames/m15/regular/m15Mask{mask_name}.png",
+    "frame_mask_name_for_main_frame_layer": "/img/frames/custom/m15-eighth/regular/Frame.png",
+    "border_mask_name_for_main_frame_layer": "/img/frames/custom/m15-eighth/regular/Border.png",
+
+    # --- Shared Bounds ---
+    "art_bounds": { "x": 0.0767, "y": 0.1129, "width": 0.8476, "height": 0.4429 },
+    "watermark_bounds": { "x": 0.5, "y": 0.7762, "width": 0.75, "height": 0.2305 },
+    "legend_crown_bounds": { "height": 0.1667, "width": 0.9454, "x": 0.0274, "y": 0.0191 },
+    "legend_crown_cover_bounds": { "height": 0.0177, "width": 0.9214, "x": 0.0394, "y": 0.0277 },
+    "pt_bounds": { "height": 0.0733, "width": 0.188, "x": 0.7573, "y": 0.9052380952380953 },
+
+    # --- Text Boxes ---
+    "text": {
+        "mana": { "name": "Mana Cost", "y": 0.0613, "width": 0.9292, "height": 0.03380952380952381, "oneLine": True, "size": 0.043345543345543344, "align": "right", "shadowX": -0.001, "shadowY": 0.0029, "manaCost": True, "manaSpacing": 0 },
+        "title": { "name": "Title", "x": 0.0854, "y": 0.0522, "width": 0.8292, "height": 0.0543, "oneLine": True, "font": "belerenb", "size": 0.0381 },
+        "type": { "name": "Type", "x": 0.0854, "y": 0.5664, "width": 0.8292, "height": 0.0543, "oneLine": True, "font": "belerenb", "size": 0.0324 },
+        "rules": { "name": "Rules Text", "x": 0.086, "y": 0.6303, "width": 0.828, "height": 0.2875, "size": 0.0362 },
+        "pt": { "name": "Power/Toughness", "x": 0.7928, "y": 0.9223809523809524, "width": 0.1367, "height": 0.0372, "size": 0.0372, "font": "belerenbsc", "oneLine": True, "align": "center" }
+    },
+
+    "uses_frame_set": False,
+    "shows_flavor_bar": True,
+}
+
+# The artist and copyright lines differ between the M15 frames only in the conditionalcolor
+# prefix listing which frames turn the text white; the text after it is shared.
+M15_ARTIST_TEXT = "\uFFEE {elemidinfo-artist}"
+M15_WIZARDS_TEXT = "\u2122 & \u00a9 1993-{elemidinfo-year} Wizards of the Coast, Inc. {elemidinfo-number}"
@@ -15,19 +15,21 @@ from config import (
     init_logging,
     DEFAULT_API_DELAY_MS 
 )
-from scryfall_processor import ScryfallCardProcessor
-from exceptions import Scry2CCException
 
-init_logging()
+# Logging setup and the processor stack (requests, PIL, frame configs) are deferred to main(),
+# after argument parsing, so --help and usage errors return without paying for them.
 logger = logging.getLogger(__name__)
 
-def main():
+_FRAME_CHOICES = ("seventh", "8th", "m15", "m15ub", "m15regularnew", "modern")
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser; has no side effects, so it can be exercised on its own."""
     parser = argparse.ArgumentParser(description='Process MTG cards and create CardConjurer JSON. Provide EITHER an input_file OR --fetch_basic_land.')
     
     parser.add_argument('input_file', nargs='?', default=None, 
                         help='Path to the input file containing card names. Ignored if --fetch_basic_land is used.')
     parser.add_argument('--output_file', '-o', help='Path to the output JSON file', default='mtg_cards_output.cardconjurer')
-    parser.add_argument('--frame', '-f', help='Frame type to use', default='seventh', choices=['seventh', '8th', 'm15', 'm15ub', 'm15regularnew', 'modern']) 
+    parser.add_argument('--frame', '-f', help='Frame type to use', default='seventh', choices=_FRAME_CHOICES) 
     parser.add_argument('--frame_set', '-s', help='Frame set to use (only for seventh)', default='regular')
     parser.add_argument('--legendary_crowns', action='store_true', help='Add legendary crowns for M15/M15UB frames (if applicable)')
     parser.add_argument('--auto_fit_art', action='store_true', help='Automatically calculate art X, Y, and Zoom to fit frame')
@@ -36,6 +38,10 @@ def main():
                         help='Override the set symbol using this code (e.g., "myset", "proxy"). Rarity is still used.')
     parser.add_argument('--api_delay_ms', type=int, default=DEFAULT_API_DELAY_MS, 
                         help=f'Delay in milliseconds between Scryfall API calls (default: {DEFAULT_API_DELAY_MS}ms)')
+    parser.add_argument('--bulk-data', action='store_true',
+                        help="Answer printing searches from Scryfall's default_cards bulk dump (downloaded to ~/.cache/scry2cc and refreshed when Scryfall publishes a new one) instead of paginated API searches.")
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not use the on-disk cache of Scryfall API responses (used only when requests-cache is installed).')
     parser.add_argument('--fetch_basic_land', type=str, default=None, 
                         choices=['Forest', 'Island', 'Mountain', 'Plains', 'Swamp'],
                         help='Fetch all non-full-art printings (unique by art) of a specific basic land type. If used, input_file is ignored.')
@@ -73,9 +79,15 @@ def main():
                               help='Save images to this local directory.')
     action_group.add_argument('--upload-to-server', action='store_true',
                               help='Upload images to the server specified by --image-server-base-url.')
-    
+    output_options_group.add_argument('--refetch-art', action='store_true',
+                                      help='With --output-dir, download the original art from Scryfall again even if an earlier run already saved it.')
+    return parser
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
-    logger.debug(f"Parsed args: {args}") 
+    init_logging()
+    logger.debug("Parsed args: %s", args)
 
     if not args.input_file and not args.fetch_basic_land:
         parser.error("Either an input_file or --fetch_basic_land must be specified.")
@@ -94,6 +106,9 @@ def main():
         parser.error("--ilaria_base_url is required when --upscale_art is enabled.")
     # --- END MODIFICATION ---
     
+    from scryfall_processor import ScryfallCardProcessor
+    from exceptions import Scry2CCException
+
     set_include_list = [s.strip().lower() for s in args.set_include.split(',')] if args.set_include else None
     set_exclude_list = [s.strip().lower() for s in args.set_exclude.split(',')] if args.set_exclude else None
 
@@ -111,6 +126,8 @@ def main():
             art_mode=args.art_mode,
             set_include=set_include_list,
             set_exclude=set_exclude_list,
+            use_http_cache=not args.no_cache,
+            use_bulk_data=args.bulk_data,
             
             upscale_art=args.upscale_art,
             ilaria_upscaler_base_url=args.ilaria_base_url,
@@ -123,10 +140,12 @@ def main():
             image_server_path_prefix=args.image_server_path_prefix,
             
             output_dir=args.output_dir,
-            upload_to_server=args.upload_to_server
+            upload_to_server=args.upload_to_server,
+            refetch_art=args.refetch_art
         )
-        result = processor.process_cards()
-        processor.save_output(args.output_file, result)
+        # Background upscales are applied to cards after the run, so cards are only streamed to disk without them.
+        cards = processor.process_cards() if args.upscale_art else processor.iter_cards()
+        processor.save_output(args.output_file, cards)
     except Scry2CCException as e:
         logger.error(f"A critical error occurred: {e.reason}")
         if e.detail:
@@ -3,29 +3,144 @@ Utility functions for interacting with the Scryfall API
 """
 import logging
 import requests
+import threading
 import time
-from typing import Dict, Optional, List
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from exceptions import ScryfallAPIException
+from scryfall_bulk_data import _DEFAULT_CACHE_DIR, BulkDataProvider
+
+try:
+    import requests_cache
+except ImportError: # Optional; without it every run fetches from Scryfall.
+    requests_cache = None
+
+try:
+    import orjson
+except ImportError: # Optional; response bodies are then decoded by requests' own json().
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Scryfall's /cards/collection accepts at most 75 identifiers per request.
+_COLLECTION_BATCH_SIZE = 75
+# On-disk cache of API responses, shared by consecutive runs; card and set data change rarely.
+# Kept beside the bulk dump rather than in the working directory.
+_HTTP_CACHE_NAME = str(_DEFAULT_CACHE_DIR / "scryfall_cache")
+_HTTP_CACHE_EXPIRY = timedelta(days=7)
+
+# Requests allowed back to back before the average rate applies.
+_RATE_LIMIT_BURST = 10
+
+def _json_body(response):
+    """Decode a JSON response body, with orjson when it is installed; both raise ValueError on bad JSON."""
+    return orjson.loads(response.content) if orjson is not None else response.json()
+
+class TokenBucket:
+    """Thread-safe token bucket: refills at `rate` tokens per second up to `capacity`; consume() blocks only
+    while the bucket is empty. Waiting callers reserve their token up front, so concurrent threads queue fairly."""
+    def __init__(self, rate: float, capacity: float):
+        self.rate, self.capacity = rate, capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, tokens: float = 1.0):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate) - tokens
+            self._updated = now
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0: time.sleep(wait)
+
+class _ThrottledAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a token from a shared bucket before every request that goes on the wire.
+    Responses served from the HTTP cache never reach the adapter, so they are not delayed."""
+    def __init__(self, bucket: Optional[TokenBucket], **kwargs):
+        super().__init__(**kwargs)
+        self._bucket = bucket
+
+    def send(self, request, **kwargs):
+        if self._bucket is not None: self._bucket.consume()
+        return super().send(request, **kwargs)
+
 class ScryfallAPI:
-    def __init__(self):
+    def __init__(self, min_request_interval: float = 0.1, use_http_cache: bool = True, bulk_data: Optional[BulkDataProvider] = None):
         self.base_url = "https://api.scryfall.com"
+        # When present, printing searches are answered from the local bulk dump; the API covers anything it lacks.
+        self.bulk_data = bulk_data
+        # One pooled keep-alive session for every API call; 429s and transient 5xx on GETs and on the read-only
+        # /cards/collection POST are retried with backoff, honouring Retry-After, and the last response is handed
+        # back to the usual status handling.
+        if use_http_cache and requests_cache is not None:
+            _DEFAULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            self._session = requests_cache.CachedSession(_HTTP_CACHE_NAME, backend='sqlite', expire_after=_HTTP_CACHE_EXPIRY, allowable_methods=('GET', 'POST'), cache_control=True)
+        else:
+            if use_http_cache: logger.debug("requests_cache is not installed; Scryfall responses will not be cached on disk.")
+            self._session = requests.Session()
+        self._session.headers.update({"User-Agent": "scry2cc/1.0", "Accept": "application/json"})
+        retry = Retry(total=5, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"}, respect_retry_after_header=True, raise_on_status=False)
+        # Scryfall asks for about 10 requests/second on average; the bucket refills at one request per interval,
+        # so responses slower than the interval never add a sleep. A zero interval disables the limit.
+        bucket = TokenBucket(rate=1.0 / min_request_interval, capacity=_RATE_LIMIT_BURST) if min_request_interval > 0 else None
+        self._session.mount("https://", _ThrottledAdapter(bucket, pool_connections=8, pool_maxsize=8, max_retries=retry))
+        # Prefetches the next page of each running search; one worker per concurrent lookup thread is plenty.
+        self._page_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="scryfall-page")
+        # Lowercased name -> card data, filled by get_cards_by_names_batch and by earlier fuzzy lookups.
+        self._cards_by_name: Dict[str, Dict] = {}
+        # Set code -> set data; many cards share a handful of sets. Failures are not cached.
+        self._set_data_cache: Dict[str, Dict] = {}
     
+    def get_cards_by_names_batch(self, names: List[str]) -> Dict[str, Dict]:
+        """Fetch many cards by exact name through /cards/collection, 75 per request. Returns lowercased name -> card data."""
+        found: Dict[str, Dict] = {}
+        if self.bulk_data:
+            # Exact names are answered from the local dump; only names it lacks go to the API.
+            for n in names:
+                card = self.bulk_data.card_by_name(n)
+                if card is not None: self._cards_by_name.setdefault(n.lower(), card)
+        pending = list({n.lower(): n for n in names if n.lower() not in self._cards_by_name}.values())
+        for start in range(0, len(pending), _COLLECTION_BATCH_SIZE):
+            chunk = pending[start:start + _COLLECTION_BATCH_SIZE]
+            try:
+                response = self._session.post(f"{self.base_url}/cards/collection", json={"identifiers": [{"name": n} for n in chunk]}, timeout=20)
+                response.raise_for_status()
+                page_data = _json_body(response)
+            except (requests.RequestException, ValueError) as e:
+                # The batch is only a shortcut; names it misses still go through get_card_by_name one by one.
+                logger.warning(f"Batch card lookup failed for {len(chunk)} name(s), falling back to per-card lookups: {e}")
+                continue
+            for card in page_data.get('data', []):
+                full_name = card.get('name', '')
+                # Double-faced cards are requested by front face name but returned as "Front // Back".
+                for key in {full_name, *full_name.split(' // ')}:
+                    if key: found.setdefault(key.lower(), card)
+            not_found = page_data.get('not_found', [])
+            if not_found: logger.debug("Batch card lookup: %d name(s) not matched exactly, will retry fuzzily.", len(not_found))
+        self._cards_by_name.update(found)
+        return {n.lower(): self._cards_by_name[n.lower()] for n in names if n.lower() in self._cards_by_name}
+
     def get_card_by_name(self, card_name: str) -> Optional[Dict]:
         """Fetch card data from Scryfall API by name."""
+        cached = self._cards_by_name.get(card_name.lower())
+        if cached is None and self.bulk_data: cached = self.bulk_data.card_by_name(card_name)
+        if cached is not None: return cached
         try:
             # URL encode the card name for the API request
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/cards/named",
                 params={"fuzzy": card_name},
                 timeout=10
             )
             
             if response.status_code == 200:
-                return response.json()
+                card_data = _json_body(response)
+                self._cards_by_name[card_name.lower()] = card_data
+                return card_data
             else:
                 raise ScryfallAPIException(f"Failed to find card '{card_name}'", f"{response.status_code} - {response.text}")
         except requests.RequestException as e:
@@ -33,14 +148,18 @@ class ScryfallAPI:
 
     def get_set_data(self, set_code: str) -> Optional[Dict]:
         """Get detailed information about a set from Scryfall."""
+        cached = self._set_data_cache.get(set_code)
+        if cached is not None: return cached
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/sets/{set_code}",
                 timeout=10
             )
             
             if response.status_code == 200:
-                return response.json()
+                set_data = _json_body(response)
+                self._set_data_cache[set_code] = set_data
+                return set_data
             else:
                 raise ScryfallAPIException(f"Failed to get set data for '{set_code}'", f"{response.status_code} - {response.text}")
         except requests.RequestException as e:
@@ -48,6 +167,10 @@ class ScryfallAPI:
         except Exception as e:
             raise ScryfallAPIException(f"Unexpected error getting set data for '{set_code}'", str(e))
 
+    def _bulk_printings(self, oracle_id: str, set_include: Optional[List[str]], set_exclude: Optional[List[str]], **selection) -> Optional[List[Dict]]:
+        """Printings from the local bulk dump, or None when there is no dump or the card is not in it."""
+        return self.bulk_data.printings(oracle_id, set_include, set_exclude, **selection) if self.bulk_data else None
+
     def _apply_set_filters(self, query: str, set_include: Optional[List[str]] = None, set_exclude: Optional[List[str]] = None) -> str:
         if set_include:
             include_query = " OR ".join([f"set:{s}" for s in set_include])
@@ -57,60 +180,51 @@ class ScryfallAPI:
             query += f" {exclude_query}"
         return query
 
-    # --- MODIFIED search_cards to handle pagination and return List[Dict] ---
-    def search_cards(self, query: str, unique="prints", order_by="released", direction="asc") -> List[Dict]:
-        """Search for cards using the Scryfall API. Returns a list of all cards matching the query by handling pagination."""
-        all_cards = []
-        search_url = f"{self.base_url}/cards/search"
+    def _fetch_search_page(self, url: str, params: Optional[Dict], query: str, page_num: int) -> Optional[Dict]:
+        """One page of a card search; None when Scryfall answers 404 (no matches)."""
+        try:
+            response = self._session.get(url, params=params, timeout=20)
+            response.raise_for_status() 
+            return _json_body(response)
+        except requests.exceptions.HTTPError as http_err:
+            if http_err.response.status_code == 404:
+                logger.warning(f"No cards found for query: {query}")
+                return None
+            raise ScryfallAPIException(f"HTTP error occurred while searching cards (query: '{query}', page: {page_num})", f"{http_err} - {http_err.response.text}")
+        except requests.RequestException as req_err:
+            raise ScryfallAPIException(f"Request error occurred while searching cards (query: '{query}', page: {page_num})", str(req_err))
+        except Exception as e:
+            raise ScryfallAPIException(f"Unexpected error searching cards (query: '{query}', page: {page_num})", str(e))
+
+    def iter_search_cards(self, query: str, unique="prints", order_by="released", direction="asc") -> Iterator[Dict]:
+        """Yield every card matching the query, following pagination. The next page is requested in the
+        background while the caller consumes the current one."""
         params = {
             "q": query,
             "unique": unique,
             "order": order_by,
             "dir": direction
         }
-        
-        page_num = 1
-        current_search_url = search_url # Use a variable for the current page URL
+        page_num, total = 1, 0
+        page_data = self._fetch_search_page(f"{self.base_url}/cards/search", params, query, page_num)
+        while page_data is not None:
+            data_list = page_data.get('data', [])
+            if not data_list and page_num == 1: # No data on first page
+                logger.info(f"No cards found for query: {query}")
+                return
+            # Subsequent requests use the full next_page URL, which already carries the query parameters.
+            next_url = page_data.get('next_page')
+            next_page = self._page_executor.submit(self._fetch_search_page, next_url, None, query, page_num + 1) if next_url else None
+            yield from data_list
+            total += len(data_list)
+            if next_page is None: break
+            page_num += 1
+            page_data = next_page.result()
+        if total: logger.info(f"Found {total} total cards across {page_num} page(s) for query: {query}")
 
-        while current_search_url:
-            try:
-                # Only pass params on the first request, subsequent requests use the full next_page URL
-                current_params = params if page_num == 1 else None
-                # logger.debug(f"Fetching page {page_num} for query '{query}': {current_search_url} with params {current_params}")
-                
-                response = requests.get(current_search_url, params=current_params, timeout=20)
-                response.raise_for_status() 
-                
-                page_data = response.json()
-                data_list = page_data.get('data', [])
-                if not data_list and page_num == 1: # No data on first page
-                    logger.info(f"No cards found for query: {query}")
-                    return []
-                
-                all_cards.extend(data_list)
-                
-                current_search_url = page_data.get('next_page') 
-                page_num += 1
-                if current_search_url:
-                    # logger.debug(f"Found next page: {current_search_url}")
-                    time.sleep(0.1) # Scryfall API polite delay
-                # else:
-                    # logger.debug("No more pages found.")
-
-            except requests.exceptions.HTTPError as http_err:
-                if http_err.response.status_code == 404:
-                    logger.warning(f"No cards found for query: {query}")
-                else:
-                    raise ScryfallAPIException(f"HTTP error occurred while searching cards (query: '{query}', page: {page_num})", f"{http_err} - {http_err.response.text}")
-                break 
-            except requests.RequestException as req_err:
-                raise ScryfallAPIException(f"Request error occurred while searching cards (query: '{query}', page: {page_num})", str(req_err))
-            except Exception as e:
-                raise ScryfallAPIException(f"Unexpected error searching cards (query: '{query}', page: {page_num})", str(e))
-        
-        if page_num > 2 or (page_num == 2 and not current_search_url): # Log only if multiple pages or only one full page
-             logger.info(f"Found {len(all_cards)} total cards across {page_num-1} page(s) for query: {query}")
-        return all_cards
+    def search_cards(self, query: str, unique="prints", order_by="released", direction="asc") -> List[Dict]:
+        """Search for cards using the Scryfall API. Returns a list of all cards matching the query by handling pagination."""
+        return list(self.iter_search_cards(query, unique, order_by, direction))
 
     def get_earliest_printing(self, card_name: str, set_include: Optional[List[str]] = None, set_exclude: Optional[List[str]] = None) -> Optional[Dict]:
         """Get the earliest printing of a card by name, optionally filtered by sets."""
@@ -123,15 +237,15 @@ class ScryfallAPI:
             query = f"oracle_id:{oracle_id}"
             query = self._apply_set_filters(query, set_include, set_exclude)
             
-            search_results_list = self.search_cards(query, "prints", "released", "asc")
+            search_results_list = self._bulk_printings(oracle_id, set_include, set_exclude)
+            if search_results_list is None: search_results_list = self.search_cards(query, "prints", "released", "asc")
             
             if search_results_list:
                 earliest_card = search_results_list[0]
-                set_code = earliest_card.get('set')
-                if set_code:
-                    set_data = self.get_set_data(set_code)
-                    if set_data and 'released_at' in set_data:
-                        logger.info(f"Confirmed earliest printing of '{card_name}' within filters: {set_code} ({set_data['released_at']})")
+                # Search results carry their own release date, so no extra /sets request is needed to report it.
+                set_code, released_at = earliest_card.get('set'), earliest_card.get('released_at')
+                if set_code and released_at:
+                    logger.info(f"Confirmed earliest printing of '{card_name}' within filters: {set_code} ({released_at})")
                 return earliest_card
             else:
                 logger.warning(f"No printings found for card '{card_name}' with oracle_id {oracle_id} within the specified set filters.")
@@ -150,15 +264,15 @@ class ScryfallAPI:
             query = f"oracle_id:{oracle_id}"
             query = self._apply_set_filters(query, set_include, set_exclude)
             
-            search_results_list = self.search_cards(query, "prints", "released", "desc")
+            search_results_list = self._bulk_printings(oracle_id, set_include, set_exclude, newest_first=True)
+            if search_results_list is None: search_results_list = self.search_cards(query, "prints", "released", "desc")
             
             if search_results_list:
                 latest_card = search_results_list[0]
-                set_code = latest_card.get('set')
-                if set_code:
-                    set_data = self.get_set_data(set_code)
-                    if set_data and 'released_at' in set_data:
-                        logger.info(f"Confirmed latest printing of '{card_name}' within filters: {set_code} ({set_data['released_at']})")
+                # Search results carry their own release date, so no extra /sets request is needed to report it.
+                set_code, released_at = latest_card.get('set'), latest_card.get('released_at')
+                if set_code and released_at:
+                    logger.info(f"Confirmed latest printing of '{card_name}' within filters: {set_code} ({released_at})")
                 return latest_card
             else:
                 logger.warning(f"No printings found for card '{card_name}' with oracle_id {oracle_id} within the specified set filters.")
@@ -177,7 +291,8 @@ class ScryfallAPI:
             query = f"oracle_id:{oracle_id}"
             query = self._apply_set_filters(query, set_include, set_exclude)
             
-            search_results_list = self.search_cards(query, "art", "released", "asc")
+            search_results_list = self._bulk_printings(oracle_id, set_include, set_exclude, unique_art=True)
+            if search_results_list is None: search_results_list = self.search_cards(query, "art", "released", "asc")
             
             if search_results_list:
                 logger.info(f"Found {len(search_results_list)} unique art printings for '{card_name}' within the specified set filters.")
@@ -200,14 +315,15 @@ class ScryfallAPI:
         order_strategy = "released" 
         direction_strategy = "asc"  
 
-        logger.info(f"Fetching basic land printings with query: {query}")
-        
-        all_printings = self.search_cards(
-            query=query, 
-            unique=unique_strategy, 
-            order_by=order_strategy, 
-            direction=direction_strategy
-        )
+        all_printings = self.bulk_data.basic_land_printings(land_name, set_include, set_exclude) if self.bulk_data else None
+        if all_printings is None:
+            logger.info(f"Fetching basic land printings with query: {query}")
+            all_printings = self.search_cards(
+                query=query, 
+                unique=unique_strategy, 
+                order_by=order_strategy, 
+                direction=direction_strategy
+            )
         
         if not all_printings:
             logger.warning(f"No non-full-art printings found for basic land '{land_name}' with the specified filters.")
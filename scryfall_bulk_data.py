@@ -0,0 +1,141 @@
+"""
+Local index over Scryfall's default_cards bulk data, used in place of paginated API searches
+"""
+import json
+import logging
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import requests
+
+from exceptions import ScryfallAPIException
+
+try:
+    import ijson
+except ImportError: # Optional; without it the dump is parsed with json in one pass.
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+_PARSE_ERRORS = (OSError, ValueError) + ((ijson.JSONError,) if ijson is not None else ())
+
+_BULK_DATA_URL = "https://api.scryfall.com/bulk-data/default-cards"
+_DEFAULT_CACHE_DIR = Path.home() / ".cache" / "scry2cc"
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+# Non-game objects the search API leaves out with include_extras=false; art-series cards are named "X // X"
+# and would otherwise share the real card's name keys and release date.
+_EXTRA_LAYOUTS = frozenset({'art_series', 'token', 'double_faced_token', 'emblem'})
+# Bulky per-printing fields nothing here reads; dropping them keeps the in-memory index much smaller.
+_UNUSED_FIELDS = ('prices', 'purchase_uris', 'related_uris', 'legalities', 'multiverse_ids', 'all_parts', 'games', 'finishes',
+                  'uri', 'scryfall_uri', 'rulings_uri', 'prints_search_uri', 'set_uri', 'set_search_uri', 'scryfall_set_uri')
+
+class BulkDataProvider:
+    """Keeps a local copy of the default_cards dump, refreshed when Scryfall publishes a new one,
+    and answers printing lookups from an in-memory index by oracle_id and by name."""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else _DEFAULT_CACHE_DIR
+        self._dump_path = self.cache_dir / "default-cards.json"
+        self._meta_path = self.cache_dir / "default-cards.meta.json"
+        self._session = requests.Session()
+        self._session.headers.update({"User-Agent": "scry2cc/1.0", "Accept": "application/json"})
+        self._by_oracle_id: Dict[str, List[Dict]] = {}
+        self._by_name: Dict[str, List[Dict]] = {}
+
+    def load(self):
+        """Refresh the dump if needed and build the indexes; printings are kept oldest first."""
+        by_oracle_id: Dict[str, List[Dict]] = defaultdict(list)
+        by_name: Dict[str, List[Dict]] = defaultdict(list)
+        for card in self._iter_cards(self._refresh_dump()):
+            # The search API leaves out rare variations and extras unless asked for; so does the index.
+            if card.get('variation') or card.get('layout') in _EXTRA_LAYOUTS: continue
+            for field in _UNUSED_FIELDS: card.pop(field, None)
+            oracle_id = card.get('oracle_id')
+            if oracle_id: by_oracle_id[oracle_id].append(card)
+            name = card.get('name')
+            # Double-faced cards are also indexed by each face name, as /cards/collection matches them.
+            if name:
+                for key in {name, *name.split(' // ')}: by_name[key.lower()].append(card)
+        release_key = lambda card: card.get('released_at') or ''
+        for printings in (*by_oracle_id.values(), *by_name.values()): printings.sort(key=release_key)
+        self._by_oracle_id, self._by_name = dict(by_oracle_id), dict(by_name)
+        logger.info(f"Indexed {len(self._by_oracle_id)} cards from Scryfall bulk data at {self._dump_path}")
+
+    def printings(self, oracle_id: str, set_include: Optional[List[str]] = None, set_exclude: Optional[List[str]] = None,
+                  unique_art: bool = False, newest_first: bool = False) -> Optional[List[Dict]]:
+        """Printings of a card in release order, filtered by set; None when the card is not in the dump."""
+        printings = self._by_oracle_id.get(oracle_id)
+        if printings is None: return None
+        return self._select(printings, set_include, set_exclude, unique_art, newest_first)
+
+    def card_by_name(self, name: str) -> Optional[Dict]:
+        """A printing of the card with this exact (case-insensitive) name, or None; lookups by oracle_id work from any printing.
+        A card whose full name matches wins over one that only matches by a face name."""
+        key = name.lower()
+        printings = self._by_name.get(key)
+        if not printings: return None
+        return next((card for card in printings if card.get('name', '').lower() == key), printings[0])
+
+    def basic_land_printings(self, land_name: str, set_include: Optional[List[str]] = None, set_exclude: Optional[List[str]] = None) -> Optional[List[Dict]]:
+        """Non-full-art printings of a basic land, unique by art, oldest first; None when the dump has none."""
+        printings = [card for card in self._by_name.get(land_name.lower(), ()) if 'Basic' in card.get('type_line', '') and not card.get('full_art')]
+        if not printings: return None
+        return self._select(printings, set_include, set_exclude, unique_art=True)
+
+    @staticmethod
+    def _select(printings: List[Dict], set_include: Optional[List[str]], set_exclude: Optional[List[str]], unique_art: bool = False, newest_first: bool = False) -> List[Dict]:
+        if set_include: printings = [card for card in printings if card.get('set') in set_include]
+        elif set_exclude: printings = [card for card in printings if card.get('set') not in set_exclude]
+        if newest_first: printings = printings[::-1]
+        if unique_art:
+            seen_art, unique = set(), []
+            for card in printings:
+                art_id = card.get('illustration_id') or card.get('id')
+                if art_id not in seen_art: seen_art.add(art_id); unique.append(card)
+            printings = unique
+        return list(printings)
+
+    def _refresh_dump(self) -> Path:
+        """Download the dump when Scryfall's updated_at differs from the local copy's; otherwise reuse it."""
+        try:
+            response = self._session.get(_BULK_DATA_URL, timeout=20); response.raise_for_status()
+            bulk_info = response.json()
+        except (requests.RequestException, ValueError) as e:
+            if self._dump_path.exists():
+                logger.warning(f"Could not check for newer Scryfall bulk data, using the local copy: {e}")
+                return self._dump_path
+            raise ScryfallAPIException("Failed to get Scryfall bulk data information", str(e))
+        updated_at = bulk_info.get('updated_at')
+        try: local_updated_at = json.loads(self._meta_path.read_text(encoding='utf-8')).get('updated_at')
+        except (OSError, ValueError): local_updated_at = None
+        if self._dump_path.exists() and updated_at and updated_at == local_updated_at:
+            logger.debug("Scryfall bulk data is up to date (%s).", updated_at)
+            return self._dump_path
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        part_path = self._dump_path.with_suffix('.part')
+        try:
+            logger.info(f"Downloading Scryfall bulk data ({updated_at}) to {self._dump_path}")
+            with self._session.get(bulk_info['download_uri'], stream=True, timeout=60) as download:
+                download.raise_for_status()
+                with open(part_path, 'wb') as f:
+                    for chunk in download.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE): f.write(chunk)
+            os.replace(part_path, self._dump_path)
+            self._meta_path.write_text(json.dumps({'updated_at': updated_at}), encoding='utf-8')
+        except (requests.RequestException, KeyError, OSError) as e:
+            part_path.unlink(missing_ok=True)
+            if self._dump_path.exists():
+                logger.warning(f"Failed to download newer Scryfall bulk data, using the local copy: {e}")
+                return self._dump_path
+            raise ScryfallAPIException("Failed to download Scryfall bulk data", str(e))
+        return self._dump_path
+
+    @staticmethod
+    def _iter_cards(dump_path: Path) -> Iterator[Dict]:
+        try:
+            with open(dump_path, 'rb') as f:
+                if ijson is not None: yield from ijson.items(f, 'item', use_float=True)
+                else: yield from json.load(f)
+        except _PARSE_ERRORS as e:
+            raise ScryfallAPIException(f"Failed to read Scryfall bulk data from {dump_path}", str(e))
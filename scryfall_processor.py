@@ -4,19 +4,43 @@ Main processor for converting Scryfall card data to CardConjurer format
 """
 import sys
 import json
-import time
 import logging
+import os
 import re 
-from typing import Dict, List, Optional
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from scryfall_api_utils import ScryfallAPI 
+from scryfall_bulk_data import BulkDataProvider
 from color_detector import ColorDetector
-from card_builder import CardBuilder
+from card_builder import CardBuilder, Layer
 from frame_configs import get_frame_config
-from exceptions import ScryfallAPIException, DataProcessingException
+from exceptions import Scry2CCException, ScryfallAPIException, DataProcessingException
+
+try:
+    import orjson
+except ImportError: # Optional; the stdlib encoder writes the same JSON, only slower.
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Card lookups run ahead of the build loop on this many threads; ScryfallAPI spaces the requests themselves.
+_FETCH_WORKERS = 4
+# How many upcoming cards may have their art downloading while the current one is built.
+_ART_PREFETCH_AHEAD = 8
+# Decklist lines like "4 Lightning Bolt" or "4x Lightning Bolt"; the quantity is dropped.
+_DECK_LINE_RE = re.compile(r"^\d+\s*[xX]?\s*(.+)")
+# Card name -> filename slug: drop punctuation, then turn whitespace and dash runs into single dashes.
+_NAME_PUNCT_RE = re.compile(r'[^\w\s-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_DASH_RUN_RE = re.compile(r'-+')
+
+def _json_default(obj):
+    if isinstance(obj, Layer): return obj.to_dict()
+    if isinstance(obj, Mapping): return dict(obj) # frozen frame config values
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 class ScryfallCardProcessor:
     """Main class for processing cards from Scryfall to CardConjurer format"""
     
@@ -33,6 +57,8 @@ class ScryfallCardProcessor:
                  art_mode: str = "earliest",
                  set_include: Optional[List[str]] = None,
                  set_exclude: Optional[List[str]] = None,
+                 use_http_cache: bool = True,
+                 use_bulk_data: bool = False,
                  
                  # Upscaling parameters
                  upscale_art: bool = False,
@@ -46,7 +72,8 @@ class ScryfallCardProcessor:
                  image_server_base_url: Optional[str] = None,
                  image_server_path_prefix: str = "/local_art",
                  output_dir: Optional[str] = None,
-                 upload_to_server: bool = False
+                 upload_to_server: bool = False,
+                 refetch_art: bool = False
                 ): 
         
         self.input_file = input_file
@@ -61,6 +88,10 @@ class ScryfallCardProcessor:
         self.art_mode = art_mode
         self.set_include = set_include
         self.set_exclude = set_exclude
+        self.use_http_cache = use_http_cache
+        self.use_bulk_data = use_bulk_data
+        # (card name, art mode, set filters) -> printings, so a repeated lookup on this processor costs nothing.
+        self._card_data_cache: Dict[Tuple, List[Dict]] = {}
         
         self.upscale_art = upscale_art
         self.ilaria_upscaler_base_url = ilaria_upscaler_base_url
@@ -73,11 +104,19 @@ class ScryfallCardProcessor:
         self.image_server_path_prefix = image_server_path_prefix
         self.output_dir = output_dir
         self.upload_to_server = upload_to_server
+        self.refetch_art = refetch_art
 
         logger.debug(f"ScryfallCardProcessor __init__: upscale_art='{self.upscale_art}', image_server_base_url='{self.image_server_base_url}', output_dir='{self.output_dir}', upload_to_server='{self.upload_to_server}'")
 
         self.frame_config = get_frame_config(frame_type)
-        self.scryfall_api = ScryfallAPI()  
+        bulk_data = None
+        if self.use_bulk_data:
+            try:
+                bulk_data = BulkDataProvider(); bulk_data.load()
+            except ScryfallAPIException as e:
+                logger.warning(f"Scryfall bulk data unavailable, searching through the API instead: {e.reason} - {e.detail}")
+                bulk_data = None
+        self.scryfall_api = ScryfallAPI(min_request_interval=self.api_delay_seconds, use_http_cache=self.use_http_cache, bulk_data=bulk_data)  
 
         self.card_builder = CardBuilder(
             frame_type=self.frame_type, 
@@ -100,19 +139,18 @@ class ScryfallCardProcessor:
             image_server_path_prefix=self.image_server_path_prefix,
             
             output_dir=self.output_dir,
-            upload_to_server=self.upload_to_server
+            upload_to_server=self.upload_to_server,
+            refetch_art=self.refetch_art
         ) 
     
     def format_card_filename(self, card_data: Dict) -> str:
-        import re
-        
         card_name = card_data.get('name', 'unknown')
         set_code = card_data.get('set', 'unk')
         collector_number = card_data.get('collector_number', '0')
         
-        clean_name = re.sub(r'[^\w\s-]', '', card_name.lower())
-        clean_name = re.sub(r'\s+', '-', clean_name.strip())
-        clean_name = re.sub(r'-+', '-', clean_name)
+        clean_name = _NAME_PUNCT_RE.sub('', card_name.lower())
+        clean_name = _WHITESPACE_RE.sub('-', clean_name.strip())
+        clean_name = _DASH_RUN_RE.sub('-', clean_name)
         
         clean_set = set_code.lower()
         clean_number = collector_number
@@ -120,23 +158,32 @@ class ScryfallCardProcessor:
         return f"{clean_name}_{clean_set}_{clean_number}"
     
     def load_cards_from_file(self) -> List[str]:
-        card_names = set()
+        # Insertion-ordered dedupe: each name is fetched once, and output follows the file's order.
+        card_names: Dict[str, None] = {}
         if not self.input_file: return []
         try:
             with open(self.input_file, 'r', encoding='utf-8') as file:
                 for line in file:
                     processed_line = line.strip()
-                    match = re.match(r"^\d+\s*[xX]?\s*(.+)", processed_line)
+                    match = _DECK_LINE_RE.match(processed_line)
                     if match: card_name = match.group(1).strip()
-                    elif processed_line and not processed_line.startswith('#') and not processed_line.isspace(): card_name = processed_line
+                    elif processed_line and not processed_line.startswith('#'): card_name = processed_line
                     else: continue
-                    if card_name: card_names.add(card_name)
+                    if card_name: card_names[card_name] = None
             logger.info(f"Loaded {len(card_names)} unique patterns from: {self.input_file}")
             return list(card_names)
         except Exception as e:
             raise DataProcessingException(f"Error reading {self.input_file}", str(e))
     
     def get_card_data_by_art_mode(self, card_name: str) -> List[Dict]:
+        key = (card_name.lower(), self.art_mode, tuple(sorted(self.set_include or ())), tuple(sorted(self.set_exclude or ())))
+        cached = self._card_data_cache.get(key)
+        if cached is None:
+            cached = self._card_data_cache[key] = self._fetch_card_data_by_art_mode(card_name)
+        # A fresh list each time, so callers can't change what later lookups get back.
+        return list(cached)
+
+    def _fetch_card_data_by_art_mode(self, card_name: str) -> List[Dict]:
         if self.art_mode == "earliest":
             card_data = self.scryfall_api.get_earliest_printing(card_name, set_include=self.set_include, set_exclude=self.set_exclude)
             return [card_data] if card_data else []
@@ -148,7 +195,9 @@ class ScryfallCardProcessor:
         else:
             raise DataProcessingException(f"Unknown art mode: {self.art_mode}", "Please use 'earliest', 'latest', or 'all_art'.")
     
-    def process_cards(self) -> List[Dict]:
+    def iter_cards(self) -> Iterator[Dict]:
+        """Yield each CardConjurer card as soon as it is built, in input order. Upscaled art is only swapped in by
+        process_cards(), which waits for the background upscales before returning."""
         items_to_process = [] 
         if self.fetch_basic_land_type:
             logger.info(f"Mode: Fetching basic land: {self.fetch_basic_land_type}")
@@ -158,68 +207,105 @@ class ScryfallCardProcessor:
                 items_to_process.append({"key_name": key, "card_data_obj": printing_data, "is_basic_land_fetch_item": True})
         elif self.input_file: 
             logger.info(f"Mode: Processing from file: {self.input_file} (art mode: {self.art_mode})")
-            for name in self.load_cards_from_file():
+            names = self.load_cards_from_file()
+            for name in names:
                 items_to_process.append({"key_name": name, "name_to_fetch": name, "is_basic_land_fetch_item": False})
+            # One /cards/collection request per 75 names replaces the per-card named lookup; misses fall back to fuzzy search.
+            if names:
+                prefetched = self.scryfall_api.get_cards_by_names_batch(names)
+                logger.info(f"Prefetched {len(prefetched)}/{len(names)} card(s) by exact name.")
         else:
             raise DataProcessingException("No input source.", "Please provide an input file or use --fetch-basic-land.")
 
-        if not items_to_process: logger.warning("No items to process."); return []
+        if not items_to_process: logger.warning("No items to process."); return
             
-        result = []
-        for i, item in enumerate(items_to_process):
-            card_key = item["key_name"]
-            is_basic = item["is_basic_land_fetch_item"]
+        # Lookups are independent and network-bound, so they are all queued up front; cards are still built
+        # one at a time and in input order as each lookup's result is taken.
+        # The per-card progress line is only assembled when INFO is actually logged.
+        log_progress = logger.isEnabledFor(logging.INFO)
+        fetch_executor = None if self.fetch_basic_land_type else ThreadPoolExecutor(max_workers=_FETCH_WORKERS, thread_name_prefix="scryfall-fetch")
+        try:
+            fetches = [fetch_executor.submit(self.get_card_data_by_art_mode, item["name_to_fetch"]) for item in items_to_process] if fetch_executor else None
+            for i, item in enumerate(items_to_process):
+                card_key = item["key_name"]
+                is_basic = item["is_basic_land_fetch_item"]
             
-            if is_basic:
-                scryfall_data_list = [item["card_data_obj"]]
-            else:
-                try:
-                    scryfall_data_list = self.get_card_data_by_art_mode(item["name_to_fetch"])
-                except ScryfallAPIException as e:
-                    logger.error(f"Scryfall API error for '{item['name_to_fetch']}': {e.reason} - {e.detail}")
-                    continue
+                if is_basic:
+                    scryfall_data_list = [item["card_data_obj"]]
+                else:
+                    for ahead in fetches[i + 1:i + 1 + _ART_PREFETCH_AHEAD]:
+                        if ahead.done() and not ahead.exception(): self.card_builder.prefetch_art(ahead.result())
+                    try:
+                        scryfall_data_list = fetches[i].result()
+                    except ScryfallAPIException as e:
+                        logger.error(f"Scryfall API error for '{item['name_to_fetch']}': {e.reason} - {e.detail}")
+                        continue
             
-            if not scryfall_data_list:
-                logger.warning(f"No Scryfall data for '{card_key}', skipping.")
-                continue
+                if not scryfall_data_list:
+                    logger.warning("No Scryfall data for '%s', skipping.", card_key)
+                    continue
             
-            for j, scryfall_data in enumerate(scryfall_data_list):
-                if len(scryfall_data_list) > 1:
-                    printing_key = self.format_card_filename(scryfall_data)
-                    log_prefix = f"Card from file ({i+1}/{len(items_to_process)}, art {j+1}/{len(scryfall_data_list)})"
-                else:
-                    if is_basic:
-                        printing_key = card_key
-                    else:
-                        printing_key = self.format_card_filename(scryfall_data)
-                    log_prefix = f"Basic land ({i+1}/{len(items_to_process)})" if is_basic else f"Card from file ({i+1}/{len(items_to_process)})"
-                
-                logger.info(f"{log_prefix}: {printing_key}" + (f" (Set: {scryfall_data.get('set')})" if scryfall_data else ""))
+                for j, scryfall_data in enumerate(scryfall_data_list):
+                    printing_key = card_key if is_basic and len(scryfall_data_list) == 1 else self.format_card_filename(scryfall_data)
+                    if log_progress:
+                        if len(scryfall_data_list) > 1: log_prefix = f"Card from file ({i+1}/{len(items_to_process)}, art {j+1}/{len(scryfall_data_list)})"
+                        else: log_prefix = f"Basic land ({i+1}/{len(items_to_process)})" if is_basic else f"Card from file ({i+1}/{len(items_to_process)})"
+                        logger.info("%s: %s (Set: %s)", log_prefix, printing_key, scryfall_data.get('set'))
 
-                try:
-                    color_info = ColorDetector.get_color_info(scryfall_data) 
-                    card_object = self.card_builder.build_card_data(
-                        card_name=printing_key, 
-                        card_data=scryfall_data, 
-                        color_info=color_info,
-                        is_basic_land_fetch_mode=is_basic,
-                        basic_land_type_override=self.fetch_basic_land_type if is_basic else None
-                    )
-                    result.append(card_object)
-                except Exception as e: 
-                    logger.error(f"Error processing '{printing_key}': {e}", exc_info=True)
-                
-                if self.api_delay_seconds > 0 and j < len(scryfall_data_list) - 1:
-                    time.sleep(self.api_delay_seconds)
-            
-            if self.api_delay_seconds > 0 and i < len(items_to_process) - 1:
-                time.sleep(self.api_delay_seconds)
+                    try:
+                        color_info = ColorDetector.get_color_info(scryfall_data) 
+                        card_object = self.card_builder.build_card_data(
+                            card_name=printing_key, 
+                            card_data=scryfall_data, 
+                            color_info=color_info,
+                            is_basic_land_fetch_mode=is_basic,
+                            basic_land_type_override=self.fetch_basic_land_type if is_basic else None
+                        )
+                        yield card_object
+                    except Exception as e: 
+                        logger.error(f"Error processing '{printing_key}': {e}", exc_info=True)
+        finally:
+            if fetch_executor: fetch_executor.shutdown(cancel_futures=True)
+
+    def process_cards(self) -> List[Dict]:
+        result = list(self.iter_cards())
+        upscaled = self.card_builder.finish_pending_upscales()
+        if upscaled: logger.info(f"Applied {upscaled} background upscale(s).")
         return result
     
-    def save_output(self, output_file: str, data: List[Dict]):
+    def save_output(self, output_file: str, data: Iterable[Dict]):
+        """Write the cards as a JSON array. data may be a generator such as iter_cards(); cards are written as it yields them."""
+        # Written beside the target and moved over it only once complete, so an interrupted run keeps the previous output.
+        tmp_file = f"{output_file}.tmp"
         try:
-            with open(output_file, 'w', encoding='utf-8') as f: json.dump(data, f, indent=2)
+            if orjson is not None:
+                # Layers must still go through _json_default, which drops bounds=None; orjson would otherwise encode the dataclass itself.
+                option = orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS
+                # Cards are encoded one at a time so only one card's bytes are held at once. Both encoders escape newlines
+                # inside strings, so shifting each card's lines by two spaces yields the same file as dumping the list.
+                with open(tmp_file, 'wb') as f:
+                    written = 0
+                    for card in data:
+                        f.write(b",\n  " if written else b"[\n  ")
+                        f.write(orjson.dumps(card, default=_json_default, option=option).replace(b"\n", b"\n  "))
+                        written += 1
+                    f.write(b"\n]" if written else b"[]")
+                    f.flush(); os.fsync(f.fileno())
+            else:
+                # ensure_ascii=False writes raw UTF-8 like orjson, so the file is the same whichever encoder is installed.
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    written = 0
+                    for card in data:
+                        f.write(",\n  " if written else "[\n  ")
+                        f.write(json.dumps(card, indent=2, default=_json_default, ensure_ascii=False).replace("\n", "\n  "))
+                        written += 1
+                    f.write("\n]" if written else "[]")
+                    f.flush(); os.fsync(f.fileno())
+            os.replace(tmp_file, output_file)
             logger.info(f"Output saved to {output_file}")
+        except Scry2CCException: raise # raised while producing the cards, not while writing them
         except Exception as e:
             raise DataProcessingException(f"Error saving output to {output_file}", str(e))
+        finally:
+            if os.path.exists(tmp_file): os.remove(tmp_file)
 
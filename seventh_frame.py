@@ -2,6 +2,11 @@
 Configuration for 7th Edition frames
 """
 
+# White text with a drop shadow, shared by the title, type line and P/T boxes.
+_SHADOWED_TEXT = {"color": "white", "shadowX": 0.002, "shadowY": 0.0015}
+# The artist, copyright and footer lines are centred in the same white, single-line box.
+_BOTTOM_INFO_STYLE = {"x": 0.1, "width": 0.8, "oneLine": True, "align": "center", "color": "white"}
+
 SEVENTH_FRAME = {
     "width": 2010,
     "height": 2814,
@@ -69,9 +74,7 @@ SEVENTH_FRAME = {
             "oneLine": True,
             "font": "goudymedieval",
             "size": 0.041,
-            "color": "white",
-            "shadowX": 0.002,
-            "shadowY": 0.0015
+            **_SHADOWED_TEXT
         },
         "type": {
             "name": "Type",
@@ -83,9 +86,7 @@ SEVENTH_FRAME = {
             "oneLine": True,
             "font": "mplantin",
             "size": 0.032,
-            "color": "white",
-            "shadowX": 0.002,
-            "shadowY": 0.0015
+            **_SHADOWED_TEXT
         },
         "rules": {
             "name": "Rules Text",
@@ -108,51 +109,37 @@ SEVENTH_FRAME = {
             "font": "mplantin",
             "size": 0.0429,
             "align": "center",
-            "color": "white",
-            "shadowX": 0.002,
-            "shadowY": 0.0015
+            **_SHADOWED_TEXT
         }
     },
     "bottom_info": {
         "top": {
+            **_BOTTOM_INFO_STYLE,
             "text": "Illus. {elemidinfo-artist}",
-            "x": 0.1,
             "y": 0.9085714285714286,
-            "width": 0.8,
             "height": 0.0267,
-            "oneLine": True,
             "size": 0.0267,
-            "align": "center",
             "shadowX": 0.0021,
-            "shadowY": 0.0015,
-            "color": "white"
+            "shadowY": 0.0015
         },
         "wizards": {
+            **_BOTTOM_INFO_STYLE,
             "name": "wizards",
             "text": "™ & © {elemidinfo-year} Wizards of the Coast, Inc. {elemidinfo-number}",
-            "x": 0.1,
             "y": 0.9204761904761904,
-            "width": 0.8,
             "height": 0.0172,
-            "oneLine": True,
             "size": 0.0172,
-            "align": "center",
             "shadowX": 0.0014,
-            "shadowY": 0.001,
-            "color": "white"
+            "shadowY": 0.001
         },
         "bottom": {
+            **_BOTTOM_INFO_STYLE,
             "text": "NOT FOR SALE   CardConjurer.com",
-            "x": 0.1,
             "y": 0.9395238095238095,
-            "width": 0.8,
             "height": 0.012380952380952381,
-            "oneLine": True,
             "size": 0.012380952380952381,
-            "align": "center",
             "shadowX": 0.0014,
-            "shadowY": 0.001,
-            "color": "white"
+            "shadowY": 0.001
         }
     },
     "uses_frame_set": True  # Indicates whether the frame uses a frameSet in paths